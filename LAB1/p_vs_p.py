@@ -1,4 +1,10 @@
 
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LAB6"))
+from bitboard import cells_to_bits, is_win
+
 board = [' ' for _ in range(9)]
 
 
@@ -23,17 +29,7 @@ def player_move(player_icon, board):
 
 
 def check_win(board, player_icon):
-    win_conditions = [
-        (0, 1, 2), (3, 4, 5), (6, 7, 8),  # Rows
-        (0, 3, 6), (1, 4, 7), (2, 5, 8),  # Columns
-        (0, 4, 8), (2, 4, 6)              # Diagonals
-    ]
-    for condition in win_conditions:
-        if board[condition[0]] == player_icon and \
-           board[condition[1]] == player_icon and \
-           board[condition[2]] == player_icon:
-            return True
-    return False
+    return is_win(cells_to_bits(board, player_icon))
 
 
 def check_draw(board):
@@ -1,4 +1,9 @@
+import os
 import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LAB6"))
+from bitboard import FREE_CELLS, cells_to_bits, is_win
 
 def print_board(board):
     """Prints the Tic-Tac-Toe board."""
@@ -23,26 +28,20 @@ def player_move(board, player_symbol):
 
 def computer_move(board, computer_symbol, player_symbol):
     """Handles the computer's move with a basic AI."""
+    computer_bits = cells_to_bits(board, computer_symbol)
+    player_bits = cells_to_bits(board, player_symbol)
+    available_moves = FREE_CELLS[computer_bits | player_bits]
+
+    for i in available_moves:
+        if is_win(computer_bits | 1 << i):
+            board[i] = computer_symbol
+            return
+
+    for i in available_moves:
+        if is_win(player_bits | 1 << i):
+            board[i] = computer_symbol
+            return
 
-    for i in range(9):
-        if board[i] not in ("X", "O"):
-            temp_board = list(board)
-            temp_board[i] = computer_symbol
-            if check_win(temp_board, computer_symbol):
-                board[i] = computer_symbol
-                return
-
-  
-    for i in range(9):
-        if board[i] not in ("X", "O"):
-            temp_board = list(board)
-            temp_board[i] = player_symbol
-            if check_win(temp_board, player_symbol):
-                board[i] = computer_symbol
-                return
-
-    
-    available_moves = [i for i, spot in enumerate(board) if spot not in ("X", "O")]
     if available_moves:
         move = random.choice(available_moves)
         board[move] = computer_symbol
@@ -51,15 +50,7 @@ def computer_move(board, computer_symbol, player_symbol):
 
 def check_win(board, player_symbol):
     """Checks if a player has won."""
-    winning_combinations = [
-        [0, 1, 2], [3, 4, 5], [6, 7, 8],  # Rows
-        [0, 3, 6], [1, 4, 7], [2, 5, 8],  # Columns
-        [0, 4, 8], [2, 4, 6]            # Diagonals
-    ]
-    for combo in winning_combinations:
-        if board[combo[0]] == board[combo[1]] == board[combo[2]] == player_symbol:
-            return True
-    return False
+    return is_win(cells_to_bits(board, player_symbol))
 
 def check_draw(board):
     """Checks if the game is a draw."""
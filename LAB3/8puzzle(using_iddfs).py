@@ -1,21 +1,49 @@
-import copy
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from search_stats import SearchStats
+from sliding_puzzle import (blank_moves, is_solvable, manhattan_table, pack_tiles, slide_tile, tile_bits,
+                            unpack_tiles)
+
+_MOVE_TABLES = {}
+
+def moves_for(size):
+    """(new blank index, move name) for every legal blank move on a size x size grid.
+    Listed Right-to-Up so the DFS tries them in the same order as the old stack."""
+    if size not in _MOVE_TABLES:
+        _MOVE_TABLES[size] = [moves[::-1] for moves in blank_moves(size)]
+    return _MOVE_TABLES[size]
+
+def pack_board(board):
+    """Packs a square board, given as rows, into an integer with pack_tiles()."""
+    return pack_tiles(flatten(board), tile_bits(len(board)))
+
+def unpack_board(state, size):
+    """Inverse of pack_board, as a list of rows."""
+    tiles = unpack_tiles(state, size * size, tile_bits(size))
+    return [list(tiles[r * size:(r + 1) * size]) for r in range(size)]
+
+def flatten(board):
+    return tuple(tile for row in board for tile in row)
 
 class PuzzleState:
-    """Represents a state in the 8-puzzle problem."""
+    """Represents a state in the sliding puzzle (8-puzzle, 15-puzzle, ...)."""
     def __init__(self, board, parent=None, move=None, depth=0):
         self.board = board  # 2D list representing the puzzle board
         self.parent = parent  # Parent PuzzleState
         self.move = move  # Move that led to this state (e.g., "Up", "Down")
         self.depth = depth  # Depth of this state in the search tree
+        self.size = len(board)  # Side length of the square board
         self.blank_pos = self._find_blank()
 
     def _find_blank(self):
         """Finds the coordinates of the blank tile (0)."""
-        for r in range(3):
-            for c in range(3):
+        for r in range(self.size):
+            for c in range(self.size):
                 if self.board[r][c] == 0:
                     return r, c
-        return -1, -1 # Should not happen in a valid 8-puzzle
+        return -1, -1 # Should not happen in a valid puzzle
 
     def __eq__(self, other):
         """Compares two PuzzleState objects based on their board configuration."""
@@ -23,49 +51,250 @@ class PuzzleState:
 
     def __hash__(self):
         """Generates a hash for the PuzzleState based on its board configuration."""
-        return hash(tuple(tuple(row) for row in self.board))
-
-    def get_neighbors(self):
-        """Generates valid neighboring states by moving the blank tile."""
-        neighbors = []
-        br, bc = self.blank_pos
-        moves = [(-1, 0, "Up"), (1, 0, "Down"), (0, -1, "Left"), (0, 1, "Right")]
-
-        for dr, dc, move_name in moves:
-            new_br, new_bc = br + dr, bc + dc
-            if 0 <= new_br < 3 and 0 <= new_bc < 3:
-                new_board = copy.deepcopy(self.board)
-                new_board[br][bc], new_board[new_br][new_bc] = new_board[new_br][new_bc], new_board[br][bc]
-                neighbors.append(PuzzleState(new_board, self, move_name, self.depth + 1))
-        return neighbors
-
-def dls(start_node, goal_board, limit):
-    """Depth-Limited Search (DLS) algorithm."""
-    stack = [(start_node, [start_node.board])] # (node, path_boards)
-    
-    while stack:
-        current_node, path_boards = stack.pop()
+        return hash(pack_board(self.board))
+
+def dls(start_node, goal_board, limit, stats=None, prune_parent=False):
+    """Depth-Limited Search (DLS) algorithm. Fills in stats if given.
+
+    Searches packed integer states, so no per-node objects are created; the
+    PuzzleState chain is only built for the solution path. With prune_parent
+    the move that would undo the previous one is skipped without generating it.
+    """
+    size = start_node.size
+    bits = tile_bits(size)
+    start = pack_board(start_node.board)
+    blank = start_node.blank_pos[0] * size + start_node.blank_pos[1]
+    path = [start]       # States on the current path, in order
+    on_path = {start}    # The same states, for O(1) cycle checks
+    moves = []           # Move names along the current path
+    context = (pack_board(goal_board), limit - start_node.depth, moves_for(size), bits, stats, prune_parent)
+    if not _dls(start, blank, -1, path, on_path, moves, context):
+        return None # No solution found within the depth limit
 
-        if current_node.board == goal_board:
-            return current_node # Solution found
+    node = start_node
+    for state, move_name in zip(path[1:], moves):
+        node = PuzzleState(unpack_board(state, size), node, move_name, node.depth + 1)
+    return node
 
-        if current_node.depth < limit:
-            for neighbor in current_node.get_neighbors():
-                if neighbor.board not in path_boards: # Avoid cycles within the current path
-                    stack.append((neighbor, path_boards + [neighbor.board]))
-    return None # No solution found within the depth limit
+def _dls(state, blank, prev_blank, path, on_path, moves, context):
+    """Recursive DLS over packed states; leaves the solution in path/moves."""
+    goal, limit, move_table, bits, stats, prune_parent = context
+    if state == goal:
+        return True # Solution found
+
+    if len(moves) >= limit:
+        if stats is not None:
+            stats.cutoffs += 1
+        return False
+
+    if stats is not None:
+        stats.nodes_expanded += 1
+        stats.frontier(len(path))
+    for new_blank, move_name in move_table[blank]:
+        if prune_parent and new_blank == prev_blank:
+            continue # Would just undo the last move
+        child, _ = slide_tile(state, blank, new_blank, bits)
+        if stats is not None:
+            stats.nodes_generated += 1
+        if child in on_path: # Avoid cycles within the current path
+            continue
+        path.append(child)
+        on_path.add(child)
+        moves.append(move_name)
+        if _dls(child, new_blank, blank, path, on_path, moves, context):
+            return True
+        path.pop()
+        on_path.discard(child)
+        moves.pop()
+    return False
+
+def iddfs(initial_board, goal_board, stats=None, prune_parent=False):
+    """Iterative Deepening Depth-First Search (IDDFS) algorithm.
+
+    Unsolvable boards are rejected up-front by the inversion parity check.
+    If stats (a SearchStats) is given it collects the work of every
+    iteration, with one timing phase per depth limit. prune_parent is
+    passed on to dls().
+    """
+    if not is_solvable(flatten(initial_board), flatten(goal_board)):
+        print("This puzzle is unsolvable (inversion parity mismatch).")
+        return None
 
-def iddfs(initial_board, goal_board):
-    """Iterative Deepening Depth-First Search (IDDFS) algorithm."""
     depth = 0
     while True:
         print(f"Searching with depth limit: {depth}")
         start_node = PuzzleState(initial_board)
-        result = dls(start_node, goal_board, depth)
+        if stats is not None:
+            with stats.phase(f"depth {depth}"):
+                result = dls(start_node, goal_board, depth, stats, prune_parent)
+        else:
+            result = dls(start_node, goal_board, depth, prune_parent=prune_parent)
         if result:
             return result # Solution found
         depth += 1
 
+def _lis_length(values):
+    """Length of the longest increasing subsequence of a short list."""
+    best = []
+    for i, value in enumerate(values):
+        best.append(1 + max([best[j] for j in range(i) if values[j] < value], default=0))
+    return max(best, default=0)
+
+def build_heuristic(goal_board):
+    """
+    Precomputes Manhattan distance plus linear conflicts for a goal board.
+
+    Returns (size, manhattan, lines, line_goal): manhattan[tile][cell] is the
+    distance of tile from its goal when it sits on cell, lines lists the
+    cells of every row and then every column, and line_goal[line][tile] is
+    the tile's goal offset along that line, or -1 if its goal is elsewhere.
+    """
+    size = len(goal_board)
+    goal = flatten(goal_board)
+    lines = [tuple(r * size + c for c in range(size)) for r in range(size)]
+    lines += [tuple(r * size + c for r in range(size)) for c in range(size)]
+
+    line_goal = []
+    for line in lines:
+        offsets = [-1] * len(goal)
+        for offset, cell in enumerate(line):
+            if goal[cell]:
+                offsets[goal[cell]] = offset
+        line_goal.append(offsets)
+    return size, manhattan_table(goal), lines, line_goal
+
+def line_conflicts(tiles, line, heuristic):
+    """
+    Linear-conflict penalty of one line. Its tiles that belong in it but are
+    out of order need at least (count - LIS) of them to leave the line and
+    come back, which costs 2 extra moves each.
+    """
+    _, _, lines, line_goal = heuristic
+    goal_offsets = line_goal[line]
+    along = [goal_offsets[tiles[cell]] for cell in lines[line] if goal_offsets[tiles[cell]] >= 0]
+    return 2 * (len(along) - _lis_length(along))
+
+def estimate(tiles, heuristic):
+    """Manhattan distance plus linear conflicts of a flat tile list."""
+    _, manhattan, lines, _ = heuristic
+    h = sum(manhattan[tile][cell] for cell, tile in enumerate(tiles) if tile)
+    return h + sum(line_conflicts(tiles, line, heuristic) for line in range(len(lines)))
+
+def ida_star(initial_board, goal_board, stats=None, pdb=None):
+    """
+    IDA* search with the Manhattan distance plus linear conflicts heuristic,
+    or with an additive pattern database (a PatternDatabase for goal_board)
+    if pdb is given.
+
+    Each iteration is a depth-first search cut off at f = g + h > threshold;
+    the next threshold is the smallest f that exceeded the current one. Uses
+    the same tiny memory as IDDFS. Returns the goal PuzzleState, or None if
+    the board is unsolvable (checked up-front by inversion parity).
+    """
+    if not is_solvable(flatten(initial_board), flatten(goal_board)):
+        print("This puzzle is unsolvable (inversion parity mismatch).")
+        return None
+
+    if pdb is not None and pdb.goal != flatten(goal_board):
+        raise ValueError("The pattern database was built for a different goal")
+
+    heuristic = build_heuristic(goal_board)
+    size = heuristic[0]
+    tiles = list(flatten(initial_board))
+    start_node = PuzzleState(initial_board)
+    blank = tiles.index(0)
+    if pdb is None:
+        positions = None
+        h = estimate(tiles, heuristic)
+    else:
+        positions = [0] * len(tiles) # positions[tile] = cell, kept in step with tiles
+        for cell, tile in enumerate(tiles):
+            positions[tile] = cell
+        h = pdb.evaluate_positions(positions)
+
+    threshold = h
+    moves = []
+    while True:
+        print(f"Searching with f threshold: {threshold}")
+        if stats is not None:
+            with stats.phase(f"threshold {threshold}"):
+                result = _ida(tiles, blank, -1, 0, h, threshold, moves, heuristic, stats, pdb, positions)
+        else:
+            result = _ida(tiles, blank, -1, 0, h, threshold, moves, heuristic, stats, pdb, positions)
+        if result is True:
+            break
+        threshold = result
+
+    # Replay the moves to build the PuzzleState chain
+    bits = tile_bits(size)
+    node = start_node
+    state = pack_board(initial_board)
+    for new_blank, move_name in moves:
+        state, _ = slide_tile(state, blank, new_blank, bits)
+        blank = new_blank
+        node = PuzzleState(unpack_board(state, size), node, move_name, node.depth + 1)
+    return node
+
+def _ida(tiles, blank, prev_blank, g, h, threshold, moves, heuristic, stats, pdb=None, positions=None):
+    """One bounded DFS of IDA*, swapping tiles in place.
+
+    Returns True when the goal is reached (the path is left in moves),
+    otherwise the smallest f-value that exceeded threshold.
+    """
+    f = g + h
+    if f > threshold:
+        if stats is not None:
+            stats.cutoffs += 1
+        return f
+    if h == 0 and (pdb is None or tuple(tiles) == pdb.goal):
+        # A pdb can leave tiles out of every pattern, so h = 0 alone proves nothing
+        return True # Solution found
+
+    size, manhattan, _, _ = heuristic
+    move_table = moves_for(size)
+    if stats is not None:
+        stats.nodes_expanded += 1
+        stats.frontier(g + 1)
+    next_threshold = float('inf')
+    for new_blank, move_name in move_table[blank]:
+        if new_blank == prev_blank:
+            continue # Would just undo the last move
+        if stats is not None:
+            stats.nodes_generated += 1
+
+        tile = tiles[new_blank]
+        if pdb is not None:
+            # Only the moved tile's pattern changes its cost
+            pattern = pdb.pattern_of[tile]
+            child_h = h
+            if pattern >= 0:
+                child_h -= pdb.term(pattern, positions)
+            positions[tile] = blank
+            if pattern >= 0:
+                child_h += pdb.term(pattern, positions)
+            tiles[blank], tiles[new_blank] = tile, 0
+        else:
+            # Only the two lines across the move change their linear conflicts
+            if blank // size == new_blank // size:
+                lines = (size + blank % size, size + new_blank % size)
+            else:
+                lines = (blank // size, new_blank // size)
+            child_h = h + manhattan[tile][blank] - manhattan[tile][new_blank]
+            child_h -= sum(line_conflicts(tiles, line, heuristic) for line in lines)
+            tiles[blank], tiles[new_blank] = tile, 0
+            child_h += sum(line_conflicts(tiles, line, heuristic) for line in lines)
+
+        moves.append((new_blank, move_name))
+        result = _ida(tiles, new_blank, blank, g + 1, child_h, threshold, moves, heuristic, stats, pdb, positions)
+        if result is True:
+            return True
+        moves.pop()
+        tiles[blank], tiles[new_blank] = 0, tile
+        if pdb is not None:
+            positions[tile] = new_blank
+        next_threshold = min(next_threshold, result)
+    return next_threshold
+
 def print_solution(goal_node):
     """Prints the path from the initial state to the goal state."""
     path = []
@@ -93,7 +322,14 @@ if __name__ == "__main__":
         print(row)
     print("\nSolving...")
 
-    solution_node = iddfs(initial_board, goal_board)
+    # Pass --ida to use IDA* instead of plain IDDFS
+    if "--ida" in sys.argv[1:]:
+        stats = SearchStats("ida_star")
+        solution_node = ida_star(initial_board, goal_board, stats)
+    else:
+        stats = SearchStats("iddfs")
+        solution_node = iddfs(initial_board, goal_board, stats)
+    stats.emit()
 
     if solution_node:
         print("\nSolution Found!")
@@ -1,124 +1,579 @@
+import argparse
 import heapq
+import json
+import operator
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pattern_database import DEFAULT_PATTERNS, PatternDatabase
+from search_stats import SearchStats
+from sliding_puzzle import (BLANK, blank_moves, board_size, goal_tiles, is_solvable, manhattan_table,
+                            pack_tiles, slide_tile, tile_bits, unpack_tiles)
 
 # The goal state for the 8-puzzle
-GOAL_STATE = (1, 2, 3, 4, 5, 6, 7, 8, 0)
-BLANK = 0
+GOAL_STATE = goal_tiles(3)
 
-class PuzzleState:
-    def __init__(self, board, parent=None, move=None):
-        self.board = board
-        self.parent = parent
-        self.move = move
-        self.g_score = 0
-        self.h_score = self.manhattan_distance()
-        self.f_score = self.g_score + self.h_score
+# goal -> (distances, deltas), see heuristic_tables()
+_HEURISTIC_TABLES = {}
+
+# The clock is read once per this many expansions when a time limit is set
+TIME_CHECK_INTERVAL = 1024
+
+class SearchLimitReached(Exception):
+    """Raised when a search runs past its node or time budget."""
+
+def heuristic_tables(goal):
+    """
+    Precomputed Manhattan tables for a goal, built once and cached.
+
+    distances[tile][cell] is the tile's distance from its goal cell when it
+    sits on cell. deltas[tile][from_cell * cells + to_cell] is the change in
+    that distance when the tile slides between two adjacent cells, always
+    +1 or -1, so a child's h is its parent's h plus one lookup.
+    """
+    if goal not in _HEURISTIC_TABLES:
+        distances = manhattan_table(goal)
+        cells = len(goal)
+        deltas = [[distances[tile][to_cell] - distances[tile][from_cell]
+                   for from_cell in range(cells) for to_cell in range(cells)]
+                  for tile in range(cells)]
+        _HEURISTIC_TABLES[goal] = (distances, deltas)
+    return _HEURISTIC_TABLES[goal]
 
-    def __lt__(self, other):
-        """Used for priority queue comparison based on f_score."""
-        return self.f_score < other.f_score
+def a_star_solve(initial_board, stats=None, goal=None, pdb=None, max_nodes=None, time_limit=None):
+    """
+    Finds the optimal solution to a sliding puzzle using the A* algorithm.
 
-    def __hash__(self):
-        """Enables storing states in a set."""
-        return hash(self.board)
+    The open set holds compact (f, -g, counter, state, blank) tuples, where
+    state is the board packed into an integer; ties on f go to the deeper
+    entry and then to the oldest. A popped entry whose g is worse than the
+    best known g for its board is outdated and skipped. A board is pushed
+    again whenever a shorter path to it turns up, even after it was
+    expanded: the Manhattan distance is consistent, so that never happens
+    without a pdb, but an additive pattern database is not, and reopening
+    is what keeps the solution optimal with one. Parents are kept in a
+    dict only to rebuild the path at the end.
 
-    def __eq__(self, other):
-        """Enables comparing states."""
-        return self.board == other.board
+    Args:
+        initial_board: A tuple of size * size tiles (any square size) representing
+            the starting board configuration.
+        stats: Optional SearchStats to fill in with the work done.
+        goal: Goal tuple of the same size; defaults to tiles in order with the
+            blank last.
+        pdb: Optional PatternDatabase for the same goal, used instead of the
+            Manhattan distance.
+        max_nodes: Optional cap on the number of expanded states.
+        time_limit: Optional budget in seconds.
 
-    def manhattan_distance(self):
-        """Calculates the sum of Manhattan distances for all misplaced tiles."""
-        distance = 0
-        for i in range(9):
-            if self.board[i] != BLANK and self.board[i] != GOAL_STATE[i]:
-                current_pos = i
-                goal_pos = self.board.index(self.board[i])
+    Returns:
+        A list of tuples representing the path from the initial to the goal state,
+        or None if no solution exists. Unsolvable boards are rejected up-front
+        by the inversion parity check instead of exhausting the search space.
 
-                # Convert 1D index to 2D coordinates (row, col)
-                current_row, current_col = divmod(current_pos, 3)
-                goal_row, goal_col = divmod(goal_pos, 3)
+    Raises:
+        SearchLimitReached: If max_nodes or time_limit runs out first.
+    """
+    size = board_size(initial_board)
+    goal = tuple(goal) if goal else goal_tiles(size)
+    if pdb is not None and pdb.goal != goal:
+        raise ValueError("The pattern database was built for a different goal")
+    if not is_solvable(initial_board, goal):
+        return None
 
-                distance += abs(current_row - goal_row) + abs(current_col - goal_col)
-        return distance
+    cells = size * size
+    bits = tile_bits(size)
+    moves = blank_moves(size)
+    distances, deltas = heuristic_tables(goal)
 
-    def get_neighbors(self):
-        """Generates all valid neighboring puzzle states."""
-        neighbors = []
-        blank_index = self.board.index(BLANK)
-        blank_row, blank_col = divmod(blank_index, 3)
+    start = pack_tiles(initial_board, bits)
+    goal_state = pack_tiles(goal, bits)
+    if pdb is None:
+        h = sum(distances[tile][cell] for cell, tile in enumerate(initial_board))
+    else:
+        h = pdb.evaluate(initial_board)
+    counter = 0
+    open_set = [(h, 0, counter, start, list(initial_board).index(BLANK))]
+    g_scores = {start: 0}
+    parents = {start: None}
+    expanded = 0
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
 
+    while open_set:
+        f, neg_g, _, state, blank = heapq.heappop(open_set)
+        g = -neg_g
+        if g > g_scores[state]:
+            # Stale entry: a shorter path to this board was found after it was pushed
+            if stats is not None:
+                stats.count("stale_skipped")
+            continue
 
-        moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        if state == goal_state:
+            path = []
+            while state is not None:
+                path.append(unpack_tiles(state, cells, bits))
+                state = parents[state]
+            return path[::-1]
 
-        for dr, dc in moves:
-            new_row, new_col = blank_row + dr, blank_col + dc
+        expanded += 1
+        if max_nodes is not None and expanded > max_nodes:
+            raise SearchLimitReached(f"Expanded more than {max_nodes} states")
+        if deadline is not None and expanded % TIME_CHECK_INTERVAL == 0 and time.perf_counter() > deadline:
+            raise SearchLimitReached(f"No solution within {time_limit} s")
+        h = f - g
+        if stats is not None:
+            stats.nodes_expanded += 1
+            stats.nodes_generated += len(moves[blank])
 
-            if 0 <= new_row < 3 and 0 <= new_col < 3:
-                new_index = new_row * 3 + new_col
+        for new_blank, _ in moves[blank]:
+            child, tile = slide_tile(state, blank, new_blank, bits)
+            tentative_g_score = g + 1
+            if tentative_g_score < g_scores.get(child, float('inf')):
+                g_scores[child] = tentative_g_score
+                parents[child] = state
+                if pdb is None:
+                    child_h = h + deltas[tile][new_blank * cells + blank]
+                else:
+                    child_h = pdb.evaluate(unpack_tiles(child, cells, bits))
+                counter += 1
+                heapq.heappush(open_set, (tentative_g_score + child_h, -tentative_g_score, counter, child, new_blank))
 
-                new_board = list(self.board)
-                new_board[blank_index], new_board[new_index] = new_board[new_index], new_board[blank_index]
-                neighbors.append(PuzzleState(tuple(new_board), self, move=(dr, dc)))
+        if stats is not None:
+            stats.frontier(len(open_set))
 
-        return neighbors
+    return None
 
-def reconstruct_path(current_state):
-    """Traces back through parent pointers to find the solution path."""
+def _join_paths(meet, forward_parents, backward_parents, cells, bits):
+    """Path from the start to the goal through the meeting state of a bidirectional search."""
     path = []
-    while current_state:
-        path.append(current_state.board)
-        current_state = current_state.parent
-    return path[::-1]
+    state = meet
+    while state is not None:
+        path.append(unpack_tiles(state, cells, bits))
+        state = forward_parents[state]
+    path.reverse()
+    state = backward_parents[meet]
+    while state is not None:
+        path.append(unpack_tiles(state, cells, bits))
+        state = backward_parents[state]
+    return path
 
-def a_star_solve(initial_board):
+def bidirectional_bfs(initial_board, stats=None, goal=None):
     """
-    Finds the optimal solution to the 8-puzzle using the A* algorithm.
+    Finds an optimal solution by breadth-first search from both ends.
 
-    Args:
-        initial_board: A tuple representing the starting board configuration.
+    Each round expands one whole layer of the smaller frontier. Once a
+    layer reaches states the other side has seen, the shortest path through
+    any of them is returned. Search depth from each side is about half the
+    solution length.
+
+    Returns the path as a list of tuples, like a_star_solve, or None if the
+    board is unsolvable.
+    """
+    size = board_size(initial_board)
+    goal = tuple(goal) if goal else goal_tiles(size)
+    if not is_solvable(initial_board, goal):
+        return None
+
+    cells = size * size
+    bits = tile_bits(size)
+    moves = blank_moves(size)
+    start, goal_state = pack_tiles(initial_board, bits), pack_tiles(goal, bits)
+    if start == goal_state:
+        return [tuple(initial_board)]
+
+    # Per direction: parents, depths and the current frontier of (state, blank)
+    parents = [{start: None}, {goal_state: None}]
+    depths = [{start: 0}, {goal_state: 0}]
+    frontiers = [[(start, list(initial_board).index(BLANK))], [(goal_state, goal.index(BLANK))]]
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        other = 1 - side
+        best_meet, best_length = None, float('inf')
+        next_frontier = []
+        for state, blank in frontiers[side]:
+            if stats is not None:
+                stats.nodes_expanded += 1
+                stats.nodes_generated += len(moves[blank])
+            for child_blank, _ in moves[blank]:
+                child, _ = slide_tile(state, blank, child_blank, bits)
+                if child in depths[side]:
+                    continue
+                depths[side][child] = depths[side][state] + 1
+                parents[side][child] = state
+                next_frontier.append((child, child_blank))
+                if child in depths[other]:
+                    length = depths[side][child] + depths[other][child]
+                    if length < best_length:
+                        best_meet, best_length = child, length
+        frontiers[side] = next_frontier
+        if stats is not None:
+            stats.frontier(len(frontiers[0]) + len(frontiers[1]))
+        if best_meet is not None:
+            return _join_paths(best_meet, parents[0], parents[1], cells, bits)
+    return None
+
+def bidirectional_a_star(initial_board, stats=None, goal=None):
+    """
+    Finds an optimal solution with MM, a front-to-end bidirectional A*.
+
+    The forward search uses the Manhattan distance to the goal and the
+    backward search the Manhattan distance to the start. Both order their
+    open sets by max(f, 2g), which guarantees neither passes the midpoint
+    of an optimal path. The side with the lower priority is expanded next.
+    The search stops once the best path found through a state seen by both
+    sides costs no more than the lowest priority left in either open set.
+
+    Returns the path as a list of tuples, like a_star_solve, or None if the
+    board is unsolvable.
+    """
+    size = board_size(initial_board)
+    goal = tuple(goal) if goal else goal_tiles(size)
+    if not is_solvable(initial_board, goal):
+        return None
+
+    cells = size * size
+    bits = tile_bits(size)
+    moves = blank_moves(size)
+    start, goal_state = pack_tiles(initial_board, bits), pack_tiles(goal, bits)
+
+    # Per direction: distance table to that side's target, g-scores, parents, open heap
+    targets = [manhattan_table(goal), manhattan_table(tuple(initial_board))]
+    g_scores = [{start: 0}, {goal_state: 0}]
+    parents = [{start: None}, {goal_state: None}]
+    h0 = [sum(table[tile][cell] for cell, tile in enumerate(board))
+          for table, board in zip(targets, (initial_board, goal))]
+    counter = 0
+    open_sets = [[(h0[0], 0, counter, start, list(initial_board).index(BLANK))],
+                 [(h0[1], 0, counter, goal_state, goal.index(BLANK))]]
+    best_meet = start if start == goal_state else None
+    best_length = 0 if best_meet is not None else float('inf')
+
+    while open_sets[0] and open_sets[1]:
+        # Drop stale entries whose g has since improved
+        for side in (0, 1):
+            heap = open_sets[side]
+            while heap and heap[0][1] > g_scores[side][heap[0][3]]:
+                heapq.heappop(heap)
+                if stats is not None:
+                    stats.count("stale_skipped")
+        if not open_sets[0] or not open_sets[1]:
+            break
+        if best_length <= min(open_sets[0][0][0], open_sets[1][0][0]):
+            break
+
+        side = 0 if open_sets[0][0][0] <= open_sets[1][0][0] else 1
+        other = 1 - side
+        _, g, _, state, blank = heapq.heappop(open_sets[side])
+        if stats is not None:
+            stats.nodes_expanded += 1
+            stats.nodes_generated += len(moves[blank])
+
+        table = targets[side]
+        for child_blank, _ in moves[blank]:
+            child, _ = slide_tile(state, blank, child_blank, bits)
+            child_g = g + 1
+            if child_g >= g_scores[side].get(child, float('inf')):
+                continue
+            g_scores[side][child] = child_g
+            parents[side][child] = state
+            if child in g_scores[other] and child_g + g_scores[other][child] < best_length:
+                best_meet, best_length = child, child_g + g_scores[other][child]
+            child_h = sum(table[tile][cell] for cell, tile in enumerate(unpack_tiles(child, cells, bits)))
+            counter += 1
+            heapq.heappush(open_sets[side], (max(child_g + child_h, 2 * child_g), child_g, counter, child, child_blank))
+
+        if stats is not None:
+            stats.frontier(len(open_sets[0]) + len(open_sets[1]))
+
+    if best_meet is None:
+        return None
+    return _join_paths(best_meet, parents[0], parents[1], cells, bits)
+
+class _SMANode:
+    """A node of the SMA* search tree."""
+    __slots__ = ("state", "blank", "g", "h", "f", "depth", "parent", "children", "forgotten",
+                 "in_open", "version")
+
+    def __init__(self, state, blank, g, h, f, parent):
+        self.state = state
+        self.blank = blank
+        self.g = g
+        self.h = h
+        self.f = f
+        self.depth = parent.depth + 1 if parent else 0
+        self.parent = parent
+        self.children = {}   # child state -> node, for children still in memory
+        self.forgotten = {}  # child state -> backed-up f of a pruned child
+        self.in_open = False
+        self.version = 0     # bumped whenever the node's open-set entries go stale
+
+def sma_star_solve(initial_board, memory_limit=100_000, stats=None, goal=None):
+    """
+    Finds an optimal solution with SMA*, keeping at most memory_limit nodes.
+
+    Search proceeds like A* over a tree of nodes. Whenever the tree grows
+    past memory_limit, the shallowest leaf with the highest f is dropped,
+    and its f is remembered by its parent, which goes back on the open
+    list. Parents are given the lowest f of their children (backed up
+    through the tree), so a dropped subtree is only regenerated once
+    everything cheaper has been tried. Children get at least their
+    parent's f (pathmax). Nodes at the memory depth are dead ends, as a
+    path through them could not be held in memory.
+
+    The solution is optimal whenever an optimal path fits in memory, that
+    is, when memory_limit exceeds the solution length plus a few nodes.
 
     Returns:
-        A list of tuples representing the path from the initial to the goal state,
-        or None if no solution is found.
+        The path as a list of tuples, like a_star_solve, or None if the
+        board is unsolvable.
+
+    Raises:
+        SearchLimitReached: If no solution fits in memory_limit nodes.
     """
-    initial_state = PuzzleState(initial_board)
+    size = board_size(initial_board)
+    goal = tuple(goal) if goal else goal_tiles(size)
+    if memory_limit < 2:
+        raise ValueError("SMA* needs room for at least two nodes")
+    if not is_solvable(initial_board, goal):
+        return None
 
-    open_set = [initial_state]
-    came_from = {}
-    g_scores = {initial_state.board: 0}
+    cells = size * size
+    bits = tile_bits(size)
+    moves = blank_moves(size)
+    distances, deltas = heuristic_tables(goal)
+    goal_state = pack_tiles(goal, bits)
+    inf = float('inf')
 
-    while open_set:
-        current = heapq.heappop(open_set)
+    # best: (f, -depth, counter, version, node); worst leaves: (-f, depth, counter, version, node)
+    best, worst = [], []
+    counter = 0
 
-        if current.board == GOAL_STATE:
-            return reconstruct_path(current)
+    def push(node):
+        nonlocal counter
+        node.in_open = True
+        node.version += 1
+        counter += 1
+        heapq.heappush(best, (node.f, -node.depth, counter, node.version, node))
+        if not node.children:
+            heapq.heappush(worst, (-node.f, node.depth, counter, node.version, node))
 
-        for neighbor in current.get_neighbors():
-            tentative_g_score = g_scores[current.board] + 1
+    def backup(node):
+        """Give node the lowest f among its children, and its ancestors likewise."""
+        while node is not None:
+            lowest = min([child.f for child in node.children.values()] + list(node.forgotten.values()),
+                         default=inf)
+            if lowest == node.f:
+                break
+            node.f = lowest
+            if node.in_open:
+                push(node)
+            node = node.parent
 
-            if tentative_g_score < g_scores.get(neighbor.board, float('inf')):
-                came_from[neighbor.board] = current
-                neighbor.g_score = tentative_g_score
-                neighbor.f_score = neighbor.g_score + neighbor.h_score
+    h = sum(distances[tile][cell] for cell, tile in enumerate(initial_board))
+    root = _SMANode(pack_tiles(initial_board, bits), list(initial_board).index(BLANK), 0, h, h, None)
+    push(root)
+    in_memory = 1
 
-                g_scores[neighbor.board] = tentative_g_score
-                heapq.heappush(open_set, neighbor)
+    while best:
+        f, _, _, version, node = heapq.heappop(best)
+        if version != node.version or not node.in_open:
+            continue
+        if f == inf:
+            break
+        if node.state == goal_state:
+            path = []
+            while node is not None:
+                path.append(unpack_tiles(node.state, cells, bits))
+                node = node.parent
+            return path[::-1]
 
-    return None
+        node.in_open = False
+        node.version += 1
+        if stats is not None:
+            stats.nodes_expanded += 1
+
+        # Generate the children not already in memory, restoring dropped ones' f
+        for new_blank, _ in moves[node.blank]:
+            child_state, tile = slide_tile(node.state, node.blank, new_blank, bits)
+            if child_state in node.children or (node.parent and child_state == node.parent.state):
+                continue
+            child_h = node.h + deltas[tile][new_blank * cells + node.blank]
+            if node.depth + 1 >= memory_limit - 1 and child_state != goal_state:
+                child_f = inf
+            else:
+                child_f = max(node.f, node.g + 1 + child_h, node.forgotten.pop(child_state, 0))
+            child = _SMANode(child_state, new_blank, node.g + 1, child_h, child_f, node)
+            node.children[child_state] = child
+            push(child)
+            in_memory += 1
+            if stats is not None:
+                stats.nodes_generated += 1
+        node.forgotten.clear()
+        backup(node)
+
+        # Drop the worst leaves until the tree fits again
+        while in_memory > memory_limit and worst:
+            _, _, _, version, leaf = heapq.heappop(worst)
+            if version != leaf.version or not leaf.in_open or leaf.children or leaf is root:
+                continue
+            parent = leaf.parent
+            leaf.in_open = False
+            del parent.children[leaf.state]
+            parent.forgotten[leaf.state] = leaf.f
+            in_memory -= 1
+            if stats is not None:
+                stats.count("pruned")
+            if not parent.in_open or not parent.children:
+                push(parent)
+
+        if stats is not None:
+            stats.frontier(in_memory)
+
+    raise SearchLimitReached(f"No solution fits in {memory_limit} nodes")
 
 def print_solution(path):
     if not path:
         print("No solution found.")
         return
 
+    size = board_size(path[0])
     print("Solution path:")
     for i, board in enumerate(path):
         print(f"--- Step {i} ---")
-        for j in range(0, 9, 3):
-            print(board[j:j+3])
+        for j in range(0, len(board), size):
+            print(board[j:j+size])
     print(f"\nSolved in {len(path) - 1} moves.")
 
+# ---------- Batch Solving ----------
+# Pattern databases opened by this process, keyed by goal
+_PATTERN_DATABASES = {}
+
+def validate_board(board, goal=None):
+    """
+    Checks a board from outside (e.g. a puzzles file) and returns it as a
+    tuple of ints. Tiles may still be strings, as read_boards() leaves them.
+    Raises ValueError with the reason unless the board is square and holds
+    every tile of the goal exactly once.
+    """
+    try:
+        tiles = tuple(int(tile) if isinstance(tile, str) else operator.index(tile) for tile in board)
+    except (TypeError, ValueError):
+        raise ValueError(f"Tiles must be integers, got {' '.join(map(str, board))}") from None
+    size = board_size(tiles)
+    goal = tuple(goal) if goal else goal_tiles(size)
+    if len(goal) != len(tiles):
+        raise ValueError(f"The board has {len(tiles)} tiles but the goal has {len(goal)}")
+    if sorted(tiles) != sorted(goal):
+        raise ValueError(f"The board must hold each of the tiles {sorted(goal)} exactly once")
+    return tiles
+
+def _solve_job(args):
+    """Worker: solve one board and describe the outcome as a JSON-ready dict."""
+    index, board, goal, use_pdb, max_nodes, time_limit = args
+    result = {"index": index, "board": list(board)}
+    try:
+        board = validate_board(board, goal)
+    except ValueError as exc:
+        result.update(status="invalid", reason=str(exc))
+        return result
+    result["board"] = list(board)
+    goal = tuple(goal) if goal else goal_tiles(board_size(board))
+    pdb = None
+    if use_pdb:
+        if goal not in _PATTERN_DATABASES:
+            try:
+                _PATTERN_DATABASES[goal] = PatternDatabase(goal)
+            except ValueError as exc:
+                # No default patterns for this board size
+                result.update(status="invalid", reason=str(exc))
+                return result
+        pdb = _PATTERN_DATABASES[goal]
+
+    stats = SearchStats("a_star")
+    try:
+        with stats.phase("solve"):
+            path = a_star_solve(board, stats, goal, pdb, max_nodes, time_limit)
+    except SearchLimitReached as exc:
+        result.update(status="limit", reason=str(exc))
+    else:
+        if path is None:
+            result.update(status="unsolvable")
+        else:
+            result.update(status="solved", moves=len(path) - 1, path=[list(step) for step in path])
+    result.update(nodes=stats.nodes_expanded, seconds=stats.phases["solve"])
+    return result
+
+def solve_many(boards, workers=None, goal=None, use_pdb=False, max_nodes=None, time_limit=None):
+    """
+    Solves many boards with a_star_solve, spread over a process pool.
+
+    Results are yielded in input order as soon as each one is ready, as
+    dicts with the board's index, a status of "solved", "unsolvable",
+    "limit" or "invalid" (with a reason), the path and move count when
+    solved, and the nodes expanded and seconds spent. A malformed board
+    only fails its own entry. max_nodes and time_limit apply to each board
+    on its own. workers=1 solves in this process without starting a pool.
+    With use_pdb, boards of a size without default patterns are "invalid".
+    """
+    if use_pdb:
+        # Build missing tables once here rather than in every worker at the same time
+        boards = [tuple(board) for board in boards]
+        sizes = set()
+        for board in boards:
+            try:
+                sizes.add(board_size(validate_board(board, goal)))
+            except ValueError:
+                pass
+        for size in sizes & DEFAULT_PATTERNS.keys():
+            PatternDatabase(tuple(goal) if goal else goal_tiles(size))
+    jobs = ((index, tuple(board), goal, use_pdb, max_nodes, time_limit) for index, board in enumerate(boards))
+    if workers == 1:
+        yield from map(_solve_job, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_solve_job, jobs)
+
+def read_boards(lines):
+    """
+    Boards from text lines of tiles separated by spaces or commas, as
+    tuples of tokens; blank and # lines are skipped. Tokens are not checked
+    here, so a bad line comes back from solve_many() as an "invalid" result
+    instead of stopping the batch.
+    """
+    for line in lines:
+        line = line.split("#", 1)[0].replace(",", " ").strip()
+        if line:
+            yield tuple(line.split())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve sliding puzzles with A*.")
+    parser.add_argument("puzzles", nargs="?",
+                        help="file with one board per line, row by row with 0 as the blank ('-' for stdin); "
+                             "solves a sample board if omitted")
+    parser.add_argument("--workers", type=int, default=None, help="processes to use (default: CPU count)")
+    parser.add_argument("--max-nodes", type=int, default=None, help="expansion budget per puzzle")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds allowed per puzzle")
+    parser.add_argument("--pdb", action="store_true", help="use the pattern database heuristic")
+    args = parser.parse_args(argv)
+
+    if args.puzzles is None:
+        initial_board = (1, 2, 3, 0, 4, 6, 7, 5, 8)
+        stats = SearchStats("a_star")
+        with stats.phase("solve", trace_memory=True):
+            solution_path = a_star_solve(initial_board, stats)
+        print_solution(solution_path)
+        stats.emit()
+        return 0
 
-initial_board = (1, 2, 3, 0, 4, 6, 7, 5, 8) 
+    with (sys.stdin if args.puzzles == "-" else open(args.puzzles)) as f:
+        boards = list(read_boards(f))
+    for result in solve_many(boards, args.workers, use_pdb=args.pdb,
+                             max_nodes=args.max_nodes, time_limit=args.time_limit):
+        print(json.dumps(result), flush=True)
+    return 0
 
-solution_path = a_star_solve(initial_board)
-print_solution(solution_path)
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,12 @@
+import os
 import random
+import sys
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from n_queens import ConflictCounter
+from search_stats import SearchStats
+
 def calculate_attacking_queens(board):
     """
     Calculates the number of attacking queen pairs on the board.
@@ -18,23 +24,6 @@ def calculate_attacking_queens(board):
                 attacking_pairs += 1
     return attacking_pairs
 
-def get_neighboring_states(board):
-    """
-    Generates all possible neighboring states by moving one queen
-    in its column.
-    """
-    n = len(board)
-    neighbors = []
-    for col in range(n):
-        original_row = board[col]
-    
-        for row in range(n):
-            if row != original_row:
-                new_board = list(board)
-                new_board[col] = row
-                neighbors.append(new_board)
-    return neighbors
-
 def print_board(board):
     """
     Prints the chessboard in a readable format.
@@ -52,57 +41,128 @@ def print_board(board):
         print(line)
     print("\n")
 
-def hill_climbing_with_visualization(n=4, max_restarts=10):
+def best_move(counter, stats=None):
     """
-    Solves the N-Queens problem using hill climbing with random restarts and
-    prints each step for visualization.
+    Steepest-ascent move as (col, row, cost after the move): every queen
+    moved to every other row of its column, column by column, each scored
+    from the occupancy counters instead of building a board.
+    Only queens under attack are tried: moving a safe queen never lowers
+    the cost. The moves scored are added to stats.nodes_generated if given.
     """
-    print(f"--- Starting Hill Climbing for {n}-Queens with Visualization ---\n")
+    best_col, best_row, best_delta = None, None, 0
+    for col in range(counter.n):
+        current = counter.queen_conflicts(col)
+        if current == 0:
+            continue
+        costs = counter.placement_costs(col)
+        costs[counter.board[col]] = counter.n * 3  # not a move
+        if stats is not None:
+            stats.nodes_generated += counter.n - 1
+        lowest = min(costs)
+        if lowest - current < best_delta:
+            best_col, best_row, best_delta = col, costs.index(lowest), lowest - current
+    return best_col, best_row, counter.conflicts() + best_delta
+
+def hill_climbing(n=4, max_restarts=10, stats=None, vectorized=False, on_event=None, every=1):
+    """
+    Solves the N-Queens problem using hill climbing with random restarts.
+    Fills in stats (a SearchStats) if given. With vectorized=True each step
+    scores the whole neighbourhood at once with NumPy (see
+    vectorized_moves.py), which pays off for medium n.
+
+    Does no I/O itself. If on_event is given it is called with a dict per
+    event, keyed by "event":
+        "restart": restart number, cost and board of a new random start
+        "move":    step number, from_cost, cost and board after a move;
+                   only every k-th step is reported, with every=k
+        "stuck":   restart number and cost of a local optimum
+        "solved":  the solution board
+        "failed":  all restarts used up
+    Boards are only copied for events, so the search pays nothing for them
+    when on_event is None.
+    """
+    choose_move = best_move
+    if vectorized:
+        # NumPy is only needed for this mode
+        from vectorized_moves import best_move as choose_move
+
+    step = 0
     for restart_count in range(max_restarts):
        
         board = [random.randint(0, n - 1) for _ in range(n)]
-        current_cost = calculate_attacking_queens(board)
-        
-        print(f"Random Restart #{restart_count + 1}")
-        print("Initial board (colision: {}):".format(current_cost))
-        print_board(board)
+        counter = ConflictCounter(board)
+        current_cost = counter.conflicts()
+        if stats is not None:
+            stats.count("starts")
+        if on_event is not None:
+            on_event({"event": "restart", "restart": restart_count + 1, "cost": current_cost, "board": board})
 
         while True:
            
             if current_cost == 0:
-                print("Goal state reached! Solution found.")
-                return board
-
-           
-            neighbors = get_neighboring_states(board)
-            best_neighbor = None
-            min_cost = current_cost
+                if on_event is not None:
+                    on_event({"event": "solved", "board": list(counter.board)})
+                return list(counter.board)
 
            
-            for neighbor in neighbors:
-                neighbor_cost = calculate_attacking_queens(neighbor)
-                if neighbor_cost < min_cost:
-                    min_cost = neighbor_cost
-                    best_neighbor = neighbor
+            col, row, min_cost = choose_move(counter, stats)
+            if stats is not None:
+                stats.nodes_expanded += 1
 
            
             if min_cost >= current_cost:
-                print("Stuck in a local optimum (Cost: {}). Restarting...".format(current_cost))
+                if on_event is not None:
+                    on_event({"event": "stuck", "restart": restart_count + 1, "cost": current_cost})
                 break 
             
           
-            print(f"Moving from a colision of {current_cost} to a new min colision of {min_cost}.")
-            board = best_neighbor
+            counter.move(col, row)
+            step += 1
+            if on_event is not None and step % every == 0:
+                on_event({"event": "move", "step": step, "from_cost": current_cost, "cost": min_cost,
+                          "board": list(counter.board)})
             current_cost = min_cost
-            print_board(board)
-            time.sleep(0.5) 
-    
-    print("Failed to find a solution within the maximum number of restarts.")
+
+    if on_event is not None:
+        on_event({"event": "failed"})
     return None
 
+def hill_climbing_with_visualization(n=4, max_restarts=10, stats=None, vectorized=False, delay=0.5, every=1):
+    """
+    Runs hill_climbing() and prints each reported step for visualization,
+    pausing delay seconds after every printed move.
+    """
+    def show(event):
+        kind = event["event"]
+        if kind == "restart":
+            print(f"Random Restart #{event['restart']}")
+            print("Initial board (colision: {}):".format(event["cost"]))
+            print_board(event["board"])
+        elif kind == "move":
+            print(f"Moving from a colision of {event['from_cost']} to a new min colision of {event['cost']}.")
+            print_board(event["board"])
+            time.sleep(delay)
+        elif kind == "stuck":
+            print("Stuck in a local optimum (Cost: {}). Restarting...".format(event["cost"]))
+        elif kind == "solved":
+            print("Goal state reached! Solution found.")
+        else:
+            print("Failed to find a solution within the maximum number of restarts.")
+
+    print(f"--- Starting Hill Climbing for {n}-Queens with Visualization ---\n")
+    return hill_climbing(n, max_restarts, stats, vectorized, on_event=show, every=every)
+
 if __name__ == "__main__":
-    solution = hill_climbing_with_visualization(n=4)
+    stats = SearchStats("hill_climbing")
+    with stats.phase("solve"):
+        # Pass --vectorized to score moves with NumPy, --quiet to skip the step-by-step output
+        vectorized = "--vectorized" in sys.argv[1:]
+        if "--quiet" in sys.argv[1:]:
+            solution = hill_climbing(n=4, stats=stats, vectorized=vectorized)
+        else:
+            solution = hill_climbing_with_visualization(n=4, stats=stats, vectorized=vectorized)
     if solution:
         print("Final Solution:")
         print_board(solution)
+    stats.emit()
 
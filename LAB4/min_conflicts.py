@@ -0,0 +1,170 @@
+import argparse
+import os
+import random
+import sys
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from search_stats import SearchStats
+
+# Random free rows tried per column before a queen is placed on an attacked
+# diagonal. Most columns succeed on the first few draws, so a generous
+# limit costs little and leaves only a handful of attacked queens.
+PLACEMENT_TRIES = 128
+
+# Random partners tried for an attacked queen before moving on to the next one
+SWAP_TRIES = 1000
+
+class PermutationBoard:
+    """
+    A board with exactly one queen per row and per column, so only the
+    diagonals can hold conflicts. The board and the diagonal counters are
+    flat arrays of C ints: a million queens take about 20 MB.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.board = array("i", [0]) * n
+        self.diagonals = array("i", [0]) * (2 * n - 1)      # row - col + n - 1
+        self.anti_diagonals = array("i", [0]) * (2 * n - 1)  # row + col
+        self.conflicts = 0
+
+    def queen_conflicts(self, col):
+        """Number of queens attacking the queen in col."""
+        row = self.board[col]
+        return self.diagonals[row - col + self.n - 1] + self.anti_diagonals[row + col] - 2
+
+    def swap(self, col_a, col_b):
+        """Exchanges the rows of two queens and returns the change in attacking pairs."""
+        board, diagonals, anti_diagonals, n = self.board, self.diagonals, self.anti_diagonals, self.n
+        row_a, row_b = board[col_a], board[col_b]
+        change = 0
+        # A queen leaving a line with k queens ends k - 1 attacks ...
+        for col, row in ((col_a, row_a), (col_b, row_b)):
+            diagonals[row - col + n - 1] -= 1
+            anti_diagonals[row + col] -= 1
+            change -= diagonals[row - col + n - 1] + anti_diagonals[row + col]
+        # ... and one joining a line with k queens starts k
+        for col, row in ((col_a, row_b), (col_b, row_a)):
+            change += diagonals[row - col + n - 1] + anti_diagonals[row + col]
+            diagonals[row - col + n - 1] += 1
+            anti_diagonals[row + col] += 1
+        board[col_a], board[col_b] = row_b, row_a
+        self.conflicts += change
+        return change
+
+def greedy_permutation(n, rng, tries=PLACEMENT_TRIES):
+    """
+    Places one queen per column on distinct rows, as a PermutationBoard.
+
+    Each column draws random rows from those still free and takes the first
+    whose two diagonals are empty. Only when tries draws all fail is a queen
+    placed under attack, which happens to a few of the last columns.
+
+    Returns (board, columns placed under attack).
+    """
+    state = PermutationBoard(n)
+    board, diagonals, anti_diagonals = state.board, state.diagonals, state.anti_diagonals
+    free_rows = array("i", range(n))
+    attacked = []
+    conflicts = 0
+    draw = rng.random
+    for col in range(n):
+        remaining = n - col
+        for _ in range(tries):
+            pick = col + int(draw() * remaining)
+            row = free_rows[pick]
+            if not diagonals[row - col + n - 1] and not anti_diagonals[row + col]:
+                break
+        else:
+            attacked.append(col)
+            conflicts += diagonals[row - col + n - 1] + anti_diagonals[row + col]
+        free_rows[pick] = free_rows[col]
+        board[col] = row
+        diagonals[row - col + n - 1] += 1
+        anti_diagonals[row + col] += 1
+    state.conflicts = conflicts
+    return state, attacked
+
+def min_conflicts(n, max_steps=None, seed=None, stats=None):
+    """
+    Solves N-Queens by min-conflicts local search over permutations.
+
+    The board starts as greedy_permutation(), so only diagonal conflicts
+    remain, all of them involving the few queens it had to place under
+    attack. Each step takes a queen that is still attacked and swaps rows
+    with random other queens until a swap lowers the number of attacking
+    pairs. Swaps keep the board a permutation, and every queen a swap
+    touches is checked again later. If no swap helps any attacked queen,
+    the search restarts from a new permutation.
+
+    Args:
+        n: Board size; n = 1,000,000 is solved in seconds.
+        max_steps: Optional cap on the number of swaps tried.
+        seed: Seed for the random choices, for reproducible runs.
+        stats: Optional SearchStats to fill in.
+
+    Returns:
+        The board as an array where board[column] = row, or None if
+        max_steps runs out first or no solution exists (n = 2 or 3).
+    """
+    if n in (2, 3):
+        return None
+    rng = random.Random(seed)
+    state, attacked = greedy_permutation(n, rng)
+    if stats is not None:
+        stats.count("placed_under_attack", len(attacked))
+
+    steps = counted = 0  # swaps tried, and how many of them are already in stats
+    while state.conflicts:
+        attacked = [col for col in attacked if state.queen_conflicts(col)]
+        if not attacked:
+            # A swap can leave a conflict on a queen not tracked; look everywhere
+            attacked = [col for col in range(n) if state.queen_conflicts(col)]
+        touched = []
+        for col in attacked:
+            if not state.queen_conflicts(col):
+                continue
+            for _ in range(SWAP_TRIES):
+                if max_steps is not None and steps >= max_steps:
+                    if stats is not None:
+                        stats.nodes_expanded += steps - counted
+                        stats.nodes_generated += steps - counted
+                    return None
+                steps += 1
+                other = int(rng.random() * n)
+                if other == col:
+                    continue
+                if state.swap(col, other) < 0:
+                    touched.append(other)
+                    break
+                state.swap(col, other)
+        if stats is not None:
+            stats.nodes_expanded += steps - counted
+            stats.nodes_generated += steps - counted
+            counted = steps
+            stats.frontier(len(attacked) + len(touched))
+        if not touched:
+            # Local minimum: no swap helped any attacked queen, so start over
+            state, attacked = greedy_permutation(n, rng)
+            if stats is not None:
+                stats.count("restarts")
+            continue
+        attacked += touched
+    return state.board
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve N-Queens with min-conflicts local search.")
+    parser.add_argument("n", type=int, nargs="?", default=1_000_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-steps", type=int, default=None)
+    args = parser.parse_args()
+
+    stats = SearchStats("min_conflicts")
+    with stats.phase("solve"):
+        solution = min_conflicts(args.n, args.max_steps, args.seed, stats)
+    if solution is None:
+        print("No solution found.")
+    else:
+        print(f"Solved {args.n}-Queens; first rows: {list(solution[:10])}")
+    stats.emit()
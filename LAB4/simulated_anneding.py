@@ -1,6 +1,14 @@
+import itertools
 import random
 import math
-import copy
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from n_queens import ConflictCounter
+from search_stats import SearchStats
 
 # Board size
 N = 4
@@ -78,60 +86,151 @@ def get_neighbor_optimized(board):
     return new_board, col_to_move, current_row, new_row
 
 
-def simulated_annealing(initial_board, initial_temperature, cooling_rate, max_no_improvement):
+def simulated_annealing(initial_board, initial_temperature, cooling_rate, max_no_improvement, stats=None,
+                        on_event=None, every=1, max_restarts=None, restart_from="random", reheat=1.0):
     """
     Solves the N-Queens problem with an optimized simulated annealing.
     Includes a restart mechanism to escape local optima.
+    Fills in stats (a SearchStats) if given.
+
+    A run ends when it finds a solution, or when it has gone
+    max_no_improvement steps without a downhill move. The next run then
+    starts from a fresh random board (restart_from="random") or from the
+    best board found so far (restart_from="best"). Run k starts at
+    initial_temperature * reheat ** k, so reheat < 1 makes each reheat
+    gentler. Restarts are an outer loop, so no stack builds up however
+    long the search goes on; max_restarts caps them (None for no limit).
+
+    Does no I/O itself. If on_event is given it is called with a dict per
+    event, keyed by "event":
+        "step":    iteration, temperature, energy and board before the
+                   step, the attempted move (col, old_row, new_row), the
+                   neighbour_energy and the outcome ("downhill", "uphill"
+                   or "rejected", with the acceptance probability); only
+                   every k-th iteration is reported, with every=k
+        "restart": iteration and energy when a run is abandoned, and
+                   where the next one starts from
+        "solved":  the solution board
+    print_event() renders these as the old step-by-step trace.
+
+    Returns:
+        A run summary dict: the best "board" found and its "conflicts",
+        whether it is "solved", the number of "restarts", the total
+        "iterations", and per-run details in "runs" (start temperature,
+        start and best energy, iterations).
     """
-    current_board = copy.deepcopy(initial_board)
+    if restart_from not in ("random", "best"):
+        raise ValueError(f"restart_from must be 'random' or 'best', not {restart_from!r}")
+
+    current_board = list(initial_board)
     current_energy = calculate_conflicts(current_board)
-    temperature = initial_temperature
-    iteration = 0
-    no_improvement_count = 0
     best_board = current_board
     best_energy = current_energy
+    runs = []
+    total_iterations = 0
+
+    for restart_count in itertools.count():
+        temperature = initial_temperature * reheat ** restart_count
+        run = {"start_temperature": temperature, "start_energy": current_energy, "best_energy": current_energy,
+               "iterations": 0}
+        runs.append(run)
+        iteration = 0
+        no_improvement_count = 0
     
-    while True:
-        print(f"\n--- Iteration: {iteration}, Temperature: {temperature:.2f} ---")
-        print("Current board:")
-        print_board(current_board)
-        print(f"Current conflicts: {current_energy}")
-        
-        if current_energy == 0:
-            print("\nSolution found!")
-            return current_board
-        
-        if temperature <= 0 or no_improvement_count > max_no_improvement:
-            print(f"\nStuck in local optimum (no improvement for {max_no_improvement} steps). Restarting...")
-            return simulated_annealing(generate_random_board(len(initial_board)), initial_temperature, cooling_rate, max_no_improvement)
-            
-        neighbor_board, col, old_row, new_row = get_neighbor_optimized(current_board)
-        neighbor_energy = calculate_conflicts(neighbor_board)
-        
-        energy_difference = neighbor_energy - current_energy
+        while current_energy != 0 and temperature > 0 and no_improvement_count <= max_no_improvement:
+            neighbor_board, col, old_row, new_row = get_neighbor_optimized(current_board)
+            neighbor_energy = calculate_conflicts(neighbor_board)
+            if stats is not None:
+                stats.nodes_expanded += 1
+                stats.nodes_generated += 1
         
-        print(f"Attempting to move queen in column {col} from row {old_row} to row {new_row}.")
+            energy_difference = neighbor_energy - current_energy
+            event = None
+            if on_event is not None and iteration % every == 0:
+                event = {"event": "step", "iteration": iteration, "temperature": temperature,
+                         "energy": current_energy, "board": list(current_board), "col": col,
+                         "old_row": old_row, "new_row": new_row, "neighbor_energy": neighbor_energy,
+                         "probability": 1.0}
         
-        if energy_difference < 0:
-            print(f"Move accepted: New energy {neighbor_energy} is lower.")
-            current_board = neighbor_board
-            current_energy = neighbor_energy
-            if current_energy < best_energy:
-                best_energy = current_energy
-                best_board = current_board
-            no_improvement_count = 0
-        else:
-            acceptance_prob = math.exp(-energy_difference / temperature)
-            if random.random() < acceptance_prob:
-                print(f"Move accepted probabilistically: New energy {neighbor_energy} is higher, but accepted with probability {acceptance_prob:.4f}.")
+            if energy_difference < 0:
                 current_board = neighbor_board
                 current_energy = neighbor_energy
+                if current_energy < run["best_energy"]:
+                    run["best_energy"] = current_energy
+                if current_energy < best_energy:
+                    best_energy = current_energy
+                    best_board = current_board
+                no_improvement_count = 0
+                outcome = "downhill"
             else:
-                print(f"Move rejected: New energy {neighbor_energy} is higher.")
-            no_improvement_count += 1
+                acceptance_prob = math.exp(-energy_difference / temperature)
+                if random.random() < acceptance_prob:
+                    if stats is not None:
+                        stats.count("uphill_moves")
+                    current_board = neighbor_board
+                    current_energy = neighbor_energy
+                    outcome = "uphill"
+                else:
+                    outcome = "rejected"
+                if event is not None:
+                    event["probability"] = acceptance_prob
+                no_improvement_count += 1
+            if event is not None:
+                event["outcome"] = outcome
+                on_event(event)
             
-        temperature *= cooling_rate
-        iteration += 1
+            temperature *= cooling_rate
+            iteration += 1
+
+        run["iterations"] = iteration
+        total_iterations += iteration
+        if current_energy == 0:
+            if on_event is not None:
+                on_event({"event": "solved", "board": list(current_board)})
+            break
+        if max_restarts is not None and restart_count >= max_restarts:
+            break
+
+        if on_event is not None:
+            on_event({"event": "restart", "iteration": iteration, "energy": current_energy,
+                      "max_no_improvement": max_no_improvement, "restart_from": restart_from})
+        if stats is not None:
+            stats.count("restarts")
+        if restart_from == "best":
+            current_board = list(best_board)
+        else:
+            current_board = generate_random_board(len(initial_board))
+        current_energy = calculate_conflicts(current_board)
+
+    return {
+        "board": best_board,
+        "conflicts": best_energy,
+        "solved": best_energy == 0,
+        "restarts": len(runs) - 1,
+        "iterations": total_iterations,
+        "runs": runs,
+    }
+
+def print_event(event):
+    """Prints an event from simulated_annealing() as a step-by-step trace."""
+    kind = event["event"]
+    if kind == "solved":
+        print("\nSolution found!")
+    elif kind == "restart":
+        print(f"\nStuck in local optimum (no improvement for {event['max_no_improvement']} steps). Restarting...")
+    elif kind == "step":
+        print(f"\n--- Iteration: {event['iteration']}, Temperature: {event['temperature']:.2f} ---")
+        print("Current board:")
+        print_board(event["board"])
+        print(f"Current conflicts: {event['energy']}")
+        print(f"Attempting to move queen in column {event['col']} from row {event['old_row']} to row {event['new_row']}.")
+        if event["outcome"] == "downhill":
+            print(f"Move accepted: New energy {event['neighbor_energy']} is lower.")
+        elif event["outcome"] == "uphill":
+            print(f"Move accepted probabilistically: New energy {event['neighbor_energy']} is higher, "
+                  f"but accepted with probability {event['probability']:.4f}.")
+        else:
+            print(f"Move rejected: New energy {event['neighbor_energy']} is higher.")
 
 def print_board(board):
     """Prints the board configuration."""
@@ -145,6 +244,131 @@ def print_board(board):
                 line += " . "
         print(line)
 
+# ---------- Parallel Tempering ----------
+# Set by any replica that reaches zero conflicts; every worker polls it
+_STOP = None
+
+# Steps a replica runs between checks of the stop flag
+STOP_CHECK_INTERVAL = 256
+
+# Random columns drawn per step while looking for a queen under attack
+QUEEN_DRAWS = 8
+
+def _init_replica_worker(stop):
+    global _STOP
+    _STOP = stop
+
+def temperature_ladder(replicas, low=0.1, high=0.6):
+    """Geometrically spaced temperatures from low to high, one per replica."""
+    if replicas == 1:
+        return [low]
+    ratio = (high / low) ** (1 / (replicas - 1))
+    return [low * ratio ** k for k in range(replicas)]
+
+def _run_replica(args):
+    """
+    Worker: Metropolis moves of queens to random rows at a fixed
+    temperature, scored in O(1) with a ConflictCounter. Attacked queens are
+    drawn first: up to QUEEN_DRAWS random columns are tried per step. Stops early on a
+    solution or when another replica has set the stop flag.
+    Returns (board, conflicts, steps taken).
+    """
+    board, temperature, steps, seed = args
+    rng = random.Random(seed)
+    counter = ConflictCounter(board)
+    n = counter.n
+    step = 0
+    while step < steps and counter.conflicts():
+        if step % STOP_CHECK_INTERVAL == 0 and _STOP is not None and _STOP.is_set():
+            break
+        step += 1
+        # Prefer queens under attack, as get_neighbor_optimized() does, at O(1) a draw
+        for _ in range(QUEEN_DRAWS):
+            col = int(rng.random() * n)
+            if counter.queen_conflicts(col):
+                break
+        row = int(rng.random() * n)
+        delta = counter.delta(col, row)
+        if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+            counter.move(col, row)
+    if not counter.conflicts() and _STOP is not None:
+        _STOP.set()
+    return list(counter.board), counter.conflicts(), step
+
+def parallel_tempering(n, replicas=4, temperatures=None, sweep_steps=2000, max_rounds=None, workers=None,
+                       seed=None, stats=None):
+    """
+    Solves N-Queens with parallel tempering: replicas at a ladder of
+    temperatures each run a Metropolis chain in their own process.
+
+    The search proceeds in rounds. Each replica runs sweep_steps moves,
+    then neighbouring temperatures try to swap boards, accepted with
+    probability min(1, exp((E_i - E_j) * (1/T_i - 1/T_j))). Hot replicas
+    roam and feed good boards down to the cold ones, which refine them.
+    As soon as any replica reaches zero conflicts, a shared flag stops
+    the others mid-round.
+
+    Args:
+        n: Board size.
+        replicas: Number of chains; ignored if temperatures is given.
+        temperatures: Increasing temperature per replica; defaults to
+            temperature_ladder(replicas).
+        sweep_steps: Moves per replica between exchanges.
+        max_rounds: Optional cap on the number of rounds (None for no limit).
+        workers: Processes to use (default: one per replica).
+        seed: Seed for reproducible starting boards and chains.
+        stats: Optional SearchStats to fill in.
+
+    Returns:
+        A run summary dict like simulated_annealing(): the best "board",
+        its "conflicts", whether it is "solved", the "rounds" run, the total
+        "iterations" over all replicas, and the "exchanges" accepted.
+    """
+    temperatures = list(temperatures) if temperatures is not None else temperature_ladder(replicas)
+    rng = random.Random(seed)
+    boards = [[rng.randrange(n) for _ in range(n)] for _ in temperatures]
+    energies = [ConflictCounter(board).conflicts() for board in boards]
+    best = min(range(len(boards)), key=energies.__getitem__)
+    best_board, best_energy = boards[best], energies[best]
+    rounds = iterations = exchanges = 0
+
+    stop = multiprocessing.Event()
+    with ProcessPoolExecutor(max_workers=workers or len(temperatures), initializer=_init_replica_worker,
+                             initargs=(stop,)) as executor:
+        while best_energy and (max_rounds is None or rounds < max_rounds):
+            rounds += 1
+            jobs = [(board, temperature, sweep_steps, rng.getrandbits(64))
+                    for board, temperature in zip(boards, temperatures)]
+            for k, (board, energy, steps) in enumerate(executor.map(_run_replica, jobs)):
+                boards[k], energies[k] = board, energy
+                iterations += steps
+                if energy < best_energy:
+                    best_board, best_energy = board, energy
+            if not best_energy:
+                break
+
+            # Swap neighbours, alternating even and odd pairs between rounds
+            for k in range(rounds % 2, len(temperatures) - 1, 2):
+                exponent = (energies[k] - energies[k + 1]) * (1 / temperatures[k] - 1 / temperatures[k + 1])
+                if exponent >= 0 or rng.random() < math.exp(exponent):
+                    boards[k], boards[k + 1] = boards[k + 1], boards[k]
+                    energies[k], energies[k + 1] = energies[k + 1], energies[k]
+                    exchanges += 1
+
+    if stats is not None:
+        stats.nodes_expanded += iterations
+        stats.nodes_generated += iterations
+        stats.count("rounds", rounds)
+        stats.count("exchanges", exchanges)
+    return {
+        "board": best_board,
+        "conflicts": best_energy,
+        "solved": best_energy == 0,
+        "rounds": rounds,
+        "iterations": iterations,
+        "exchanges": exchanges,
+    }
+
 if __name__ == "__main__":
     # N is defined at the top of the file
     initial_board = generate_random_board(N)
@@ -158,8 +382,18 @@ if __name__ == "__main__":
     cooling_rate = 0.95  # Faster cooling rate
     max_no_improvement = 20 # Restart if no improvement in this many steps
     
-    final_board = simulated_annealing(initial_board, initial_temp, cooling_rate, max_no_improvement)
+    stats = SearchStats("simulated_annealing")
+    with stats.phase("solve"):
+        if "--tempering" in sys.argv[1:]:
+            # Pass --tempering to run replicas in parallel instead
+            summary = parallel_tempering(N, stats=stats)
+        else:
+            # Drop on_event (or pass --quiet) to run without the per-step trace
+            summary = simulated_annealing(initial_board, initial_temp, cooling_rate, max_no_improvement, stats,
+                                          on_event=None if "--quiet" in sys.argv[1:] else print_event)
     
     print("\n--- Final Solution ---")
-    print_board(final_board)
-    print("Final conflicts:", calculate_conflicts(final_board))
+    print_board(summary["board"])
+    print("Final conflicts:", summary["conflicts"])
+    print(f"Iterations: {summary['iterations']}")
+    stats.emit()
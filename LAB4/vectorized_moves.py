@@ -0,0 +1,59 @@
+import numpy as np
+
+# n -> (diagonal, anti-diagonal) index matrices, see line_indices()
+_LINE_INDICES = {}
+
+
+def line_indices(n):
+    """
+    Index matrices laid out [col, row]: the diagonal and the anti-diagonal
+    through each cell, matching ConflictCounter's counters.
+    """
+    if n not in _LINE_INDICES:
+        cols = np.arange(n, dtype=np.int32)[:, None]
+        rows = np.arange(n, dtype=np.int32)[None, :]
+        _LINE_INDICES[n] = (rows - cols + (n - 1), rows + cols)
+    return _LINE_INDICES[n]
+
+
+def cost_deltas(counter):
+    """
+    The full move neighbourhood of a ConflictCounter as an (n, n) array:
+    entry [col, row] is the change in attacking pairs if the queen in col
+    moved to row (0 for its own row). Built by broadcasting the row,
+    diagonal and anti-diagonal counts, which are read in place.
+    """
+    n = counter.n
+    board = np.frombuffer(counter.board, dtype=np.intc)
+    rows = np.frombuffer(counter.rows, dtype=np.intc)
+    diagonals = np.frombuffer(counter.diagonals, dtype=np.intc)
+    anti_diagonals = np.frombuffer(counter.anti_diagonals, dtype=np.intc)
+    diagonal_index, anti_diagonal_index = line_indices(n)
+
+    # Queens on the lines through every cell; on a queen's own cell that
+    # counts the queen itself three times
+    costs = rows[None, :] + diagonals[diagonal_index] + anti_diagonals[anti_diagonal_index]
+    cols = np.arange(n)
+    current = costs[cols, board] - 3
+    costs -= current[:, None]
+    costs[cols, board] = 0
+    return costs
+
+
+def best_move(counter, stats=None):
+    """
+    Vectorized version of hill_climbing.best_move(): the same (col, row,
+    cost after the move), picked with argmin over cost_deltas(). The
+    matrix is stored column by column, so ties go to the same move. Every
+    queen's moves are scored, all n * (n - 1) of them.
+    """
+    n = counter.n
+    if stats is not None:
+        stats.nodes_generated += n * (n - 1)
+    deltas = cost_deltas(counter)
+    deltas[np.arange(n), np.frombuffer(counter.board, dtype=np.intc)] = np.iinfo(deltas.dtype).max
+    col, row = divmod(int(np.argmin(deltas)), n)
+    best_delta = int(deltas[col, row])
+    if best_delta >= 0:
+        return None, None, counter.conflicts()
+    return col, row, counter.conflicts() + best_delta
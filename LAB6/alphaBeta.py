@@ -1,4 +1,12 @@
 import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from bitboard import BitBoard, is_win
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from search_stats import SearchStats
 
 # Constants
 HUMAN = 'O'
@@ -10,6 +18,22 @@ board = [[EMPTY, EMPTY, EMPTY],
          [EMPTY, EMPTY, EMPTY],
          [EMPTY, EMPTY, EMPTY]]
 
+# Transposition table entry flags
+EXACT = 0
+LOWERBOUND = 1
+UPPERBOUND = 2
+
+# (canonical position, side to move) -> (flag, value); kept across moves so later turns
+# reuse the work done on earlier ones.
+transposition_table = {}
+tt_stats = {"hits": 0, "misses": 0}
+
+# Set to False to search without the table, e.g. to measure what it saves
+use_transposition_table = True
+
+# Work done by the searches since the last stats.reset()
+stats = SearchStats("alphaBeta")
+
 
 # ---------- Utility Functions ----------
 def print_board(board, show_numbers=False):
@@ -30,21 +54,12 @@ def print_board(board, show_numbers=False):
 
 def check_winner(board):
     """Return the winner ('X', 'O') or None."""
-    for i in range(3):
-        if board[i][0] == board[i][1] == board[i][2] != EMPTY:
-            return board[i][0]
-        if board[0][i] == board[1][i] == board[2][i] != EMPTY:
-            return board[0][i]
-    if board[0][0] == board[1][1] == board[2][2] != EMPTY:
-        return board[0][0]
-    if board[0][2] == board[1][1] == board[2][0] != EMPTY:
-        return board[0][2]
-    return None
+    return BitBoard.from_grid(board, (AI, HUMAN)).winner()
 
 
 def is_full(board):
     """Check if the board is full (draw)."""
-    return all(cell != EMPTY for row in board for cell in row)
+    return BitBoard.from_grid(board, (AI, HUMAN)).is_full()
 
 
 def box_to_coords(box):
@@ -53,44 +68,97 @@ def box_to_coords(box):
     return box // 3, box % 3
 
 
+# ---------- Transposition Table ----------
+def canonical_key(board, is_maximizing):
+    """Key shared by all 8 symmetric variants of a position."""
+    return BitBoard.from_grid(board, (AI, HUMAN)).canonical(), is_maximizing
+
+
+def clear_transposition_table():
+    """Forget all cached positions and reset the hit/miss counters."""
+    transposition_table.clear()
+    tt_stats["hits"] = 0
+    tt_stats["misses"] = 0
+
+
 # ---------- Alpha-Beta Minimax ----------
 def minimax(board, depth, alpha, beta, is_maximizing):
-    """Minimax algorithm with alpha-beta pruning."""
-    winner = check_winner(board)
-    if winner == AI:
+    """Minimax algorithm with alpha-beta pruning and a transposition table."""
+    return _minimax(BitBoard.from_grid(board, (AI, HUMAN)), depth, alpha, beta, is_maximizing)
+
+
+def _minimax(state, depth, alpha, beta, is_maximizing):
+    """Alpha-beta search over a BitBoard, updated in place with make/unmake."""
+    bits = state.bits
+    if is_win(bits[AI]):
         return 1
-    elif winner == HUMAN:
+    elif is_win(bits[HUMAN]):
         return -1
-    elif is_full(board):
+    elif state.is_full():
         return 0
+    if not use_transposition_table:
+        return _search(state, depth, alpha, beta, is_maximizing)
 
+    # Scores do not depend on depth, so any stored entry can be reused.
+    key = (state.canonical(), is_maximizing)
+    entry = transposition_table.get(key)
+    if entry is not None:
+        tt_stats["hits"] += 1
+        flag, value = entry
+        if flag == EXACT:
+            return value
+        elif flag == LOWERBOUND:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if beta <= alpha:
+            return value
+    else:
+        tt_stats["misses"] += 1
+
+    value = _search(state, depth, alpha, beta, is_maximizing)
+
+    # A score outside the (alpha, beta) window is only a bound.
+    if value <= alpha:
+        flag = UPPERBOUND
+    elif value >= beta:
+        flag = LOWERBOUND
+    else:
+        flag = EXACT
+    transposition_table[key] = (flag, value)
+    return value
+
+
+def _search(state, depth, alpha, beta, is_maximizing):
+    """Expand the children of a non-terminal position."""
+    stats.nodes_expanded += 1
     if is_maximizing:
         max_eval = -math.inf
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] == EMPTY:
-                    board[i][j] = AI
-                    eval = minimax(board, depth + 1, alpha, beta, False)
-                    board[i][j] = EMPTY
-                    max_eval = max(max_eval, eval)
-                    alpha = max(alpha, eval)
-                    if beta <= alpha:
-                        # Prune: no need to explore further
-                        return max_eval
+        for cell in state.free_cells():
+            stats.nodes_generated += 1
+            state.make(cell, AI)
+            eval = _minimax(state, depth + 1, alpha, beta, False)
+            state.unmake(cell, AI)
+            max_eval = max(max_eval, eval)
+            alpha = max(alpha, eval)
+            if beta <= alpha:
+                # Prune: no need to explore further
+                stats.cutoffs += 1
+                return max_eval
         return max_eval
     else:
         min_eval = math.inf
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] == EMPTY:
-                    board[i][j] = HUMAN
-                    eval = minimax(board, depth + 1, alpha, beta, True)
-                    board[i][j] = EMPTY
-                    min_eval = min(min_eval, eval)
-                    beta = min(beta, eval)
-                    if beta <= alpha:
-                        # Prune: no need to explore further
-                        return min_eval
+        for cell in state.free_cells():
+            stats.nodes_generated += 1
+            state.make(cell, HUMAN)
+            eval = _minimax(state, depth + 1, alpha, beta, True)
+            state.unmake(cell, HUMAN)
+            min_eval = min(min_eval, eval)
+            beta = min(beta, eval)
+            if beta <= alpha:
+                # Prune: no need to explore further
+                stats.cutoffs += 1
+                return min_eval
         return min_eval
 
 
@@ -98,19 +166,48 @@ def best_move(board):
     """Find the best move for the AI using alpha-beta minimax."""
     best_score = -math.inf
     move = None
+    state = BitBoard.from_grid(board, (AI, HUMAN))
 
-    for i in range(3):
-        for j in range(3):
-            if board[i][j] == EMPTY:
-                board[i][j] = AI
-                score = minimax(board, 0, -math.inf, math.inf, False)
-                board[i][j] = EMPTY
-                if score > best_score:
-                    best_score = score
-                    move = (i, j)
+    with stats.phase("best_move"):
+        for cell in state.free_cells():
+            state.make(cell, AI)
+            # Siblings only need to prove they beat the current best.
+            score = _minimax(state, 0, best_score, math.inf, False)
+            state.unmake(cell, AI)
+            if score > best_score:
+                best_score = score
+                move = divmod(cell, 3)
     return move
 
 
+# ---------- Parallel Root Split ----------
+def _score_root_move(args):
+    """Worker: exact score of the AI playing cell on the given position."""
+    ai_bits, human_bits, cell = args
+    state = BitBoard((AI, HUMAN))
+    state.bits[AI] = ai_bits | 1 << cell
+    state.bits[HUMAN] = human_bits
+    return _minimax(state, 0, -math.inf, math.inf, False)
+
+
+def parallel_best_move(board, max_workers=None):
+    """Same answer as best_move(), with each root move searched in its own
+    process. Root moves get a full window since siblings cannot share
+    alpha, and each worker keeps its own transposition table."""
+    state = BitBoard.from_grid(board, (AI, HUMAN))
+    cells = state.free_cells()
+    if not cells:
+        return None
+
+    jobs = [(state.bits[AI], state.bits[HUMAN], cell) for cell in cells]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        scores = list(executor.map(_score_root_move, jobs))
+
+    # First best in board order, matching the sequential search
+    best = max(range(len(cells)), key=lambda i: (scores[i], -i))
+    return divmod(cells[best], 3)
+
+
 # ---------- Game Loop ----------
 def play_game():
     print("Tic Tac Toe — You are O, AI is X")
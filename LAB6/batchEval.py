@@ -0,0 +1,83 @@
+import numpy as np
+
+from bitboard import WIN_MASKS, BitBoard, iter_bits
+from minMax import AI, EMPTY, HUMAN, NOT_IN_BOOK, book, search_best_move
+
+# Cell codes used in encoded boards
+CODES = {EMPTY: 0, AI: 1, HUMAN: 2}
+SYMBOLS = (EMPTY, AI, HUMAN)
+
+# (8, 3) cell indices of every winning line
+LINES = np.array([tuple(iter_bits(mask)) for mask in WIN_MASKS])
+
+# Base-3 place values, matching BitBoard.index() with symbols (AI, HUMAN)
+POWERS = 3 ** np.arange(9)
+
+
+def encode_boards(boards):
+    """Pack a list of 3x3 grids into an (N, 9) array: 0 empty, 1 AI, 2 HUMAN."""
+    return np.array([[CODES[cell] for row in grid for cell in row] for grid in boards], dtype=np.uint8)
+
+
+def check_winners(cells):
+    """Return (ai_wins, human_wins) boolean arrays for an (N, 9) batch."""
+    lines = cells[:, LINES]
+    ai_wins = (lines == 1).all(axis=2).any(axis=1)
+    human_wins = (lines == 2).all(axis=2).any(axis=1)
+    return ai_wins, human_wins
+
+
+# The opening book as a uint8 array, loaded by _load_table() on first use
+_TABLE = None
+
+
+def _load_table():
+    """
+    The opening book as a uint8 array. A missing book file is built in
+    memory once (run build_book.py to save it) and reused by later batches.
+    """
+    global _TABLE
+    if _TABLE is None:
+        if book is not None:
+            _TABLE = np.frombuffer(book, dtype=np.uint8)
+        else:
+            from build_book import build_book
+            _TABLE = np.frombuffer(build_book()[0], dtype=np.uint8)
+    return _TABLE
+
+
+def evaluate_boards(cells):
+    """
+    Best AI move and minimax score for every position in a batch.
+
+    Args:
+        cells: (N, 9) array of encoded boards (see encode_boards).
+
+    Returns:
+        (moves, values): moves holds the best cell 0-8 for the AI, or -1 on
+        finished games; values holds 1 (AI wins), 0 (draw) or -1 (AI loses).
+    """
+    cells = np.asarray(cells, dtype=np.uint8).reshape(-1, 9)
+    table = _load_table()
+
+    ai_wins, human_wins = check_winners(cells)
+    finished = ai_wins | human_wins | (cells != 0).all(axis=1)
+
+    entries = table[cells.astype(np.int64) @ POWERS]
+    in_book = entries != NOT_IN_BOOK
+    moves = np.where(in_book, entries >> 2, -1).astype(np.int8)
+    values = np.where(in_book, (entries & 3).astype(np.int8) - 1, 0).astype(np.int8)
+    values[ai_wins] = 1
+    values[human_wins] = -1
+
+    # The book only covers reachable AI-to-move positions; search the rest.
+    for i in np.flatnonzero(~in_book & ~finished):
+        state = BitBoard.from_cells([SYMBOLS[code] for code in cells[i]], (AI, HUMAN))
+        moves[i], values[i] = search_best_move(state)
+    return moves, values
+
+
+def best_moves(boards):
+    """Best (row, col) for the AI on each 3x3 grid, or None if the game is over."""
+    moves, _ = evaluate_boards(encode_boards(boards))
+    return [None if move < 0 else divmod(int(move), 3) for move in moves]
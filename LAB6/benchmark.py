@@ -0,0 +1,252 @@
+"""
+Latency and node-count benchmark for the LAB6 tic-tac-toe engines.
+
+Every run is compared with benchmark_baseline.json next to this file, which
+is checked in. Node counts are deterministic and gate on any machine;
+timings only compare fairly with a baseline saved on the same machine, so
+elsewhere pass --nodes-only, or refresh the baseline on that machine first:
+
+    python benchmark.py --save-baseline
+    python benchmark.py
+
+The baseline records the --sample and --seed it was made with, and a run
+with a different corpus is not compared against it.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import alphaBeta
+import minMax
+from bitboard import BitBoard
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# A run fails if it is this much worse than the stored baseline ...
+DEFAULT_TOLERANCE = 0.25
+
+# ... and also at least this many milliseconds slower; smaller differences
+# in sub-millisecond latencies are timer jitter
+DEFAULT_MIN_DELTA_MS = 0.05
+
+# Each position is timed this many times and the median run is kept
+DEFAULT_REPEATS = 5
+
+
+# ---------- Position Corpus ----------
+def ai_to_move_positions():
+    """Every unfinished position where the AI is to move, in index order."""
+    positions = []
+    for cells in itertools.product((minMax.EMPTY, minMax.AI, minMax.HUMAN), repeat=9):
+        if cells.count(minMax.HUMAN) - cells.count(minMax.AI) not in (0, 1):
+            continue
+        state = BitBoard.from_cells(cells, (minMax.AI, minMax.HUMAN))
+        if state.winner() or state.is_full():
+            continue
+        positions.append([list(cells[0:3]), list(cells[3:6]), list(cells[6:9])])
+    return positions
+
+
+def build_corpus(sample=None, seed=0):
+    """Fixed benchmark corpus: empty board, mid-game (2-5 marks) and
+    near-terminal (6+ marks) positions, optionally sampled down."""
+    empty = [[minMax.EMPTY] * 3 for _ in range(3)]
+    mid_game, near_terminal = [], []
+    for grid in ai_to_move_positions():
+        marks = sum(cell != minMax.EMPTY for row in grid for cell in row)
+        if 2 <= marks <= 5:
+            mid_game.append(grid)
+        elif marks >= 6:
+            near_terminal.append(grid)
+
+    if sample is not None:
+        rng = random.Random(seed)
+        mid_game = rng.sample(mid_game, min(sample, len(mid_game)))
+        near_terminal = rng.sample(near_terminal, min(sample, len(near_terminal)))
+    return {"empty": [empty], "mid_game": mid_game, "near_terminal": near_terminal}
+
+
+# ---------- Engines ----------
+def _minimax_search(grid):
+    return minMax.search_best_move(BitBoard.from_grid(grid, (minMax.AI, minMax.HUMAN)))
+
+
+def _alphabeta_plain(grid):
+    alphaBeta.use_transposition_table = False
+    try:
+        return alphaBeta.best_move(grid)
+    finally:
+        alphaBeta.use_transposition_table = True
+
+
+def _alphabeta_cold(grid):
+    alphaBeta.clear_transposition_table()
+    return alphaBeta.best_move(grid)
+
+
+# name -> (reset before the corpus, move function, stats object)
+ENGINES = {
+    "minimax": (lambda: None, _minimax_search, minMax.stats),
+    "minimax+book": (lambda: None, minMax.best_move, minMax.stats),
+    # No transposition table at all
+    "alphabeta": (lambda: None, _alphabeta_plain, alphaBeta.stats),
+    # Table cleared before every position, so it only helps within one search
+    "alphabeta+tt": (lambda: None, _alphabeta_cold, alphaBeta.stats),
+    # Table kept across the whole corpus, as in a game
+    "alphabeta+tt-warm": (alphaBeta.clear_transposition_table, alphaBeta.best_move, alphaBeta.stats),
+}
+
+
+# ---------- Measurement ----------
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def run_engine(name, positions, repeats=DEFAULT_REPEATS):
+    """
+    Time one engine over a list of positions. The corpus is run repeats
+    times, each from a fresh reset so every pass does the same work, and
+    each position keeps its median time.
+    """
+    reset, move_fn, stats = ENGINES[name]
+    runs = [[] for _ in positions]
+    for _ in range(repeats):
+        reset()
+        stats.reset()
+        for i, grid in enumerate(positions):
+            start = time.perf_counter()
+            move_fn([row[:] for row in grid])
+            runs[i].append(time.perf_counter() - start)
+
+    latencies = [percentile(times, 50) for times in runs]
+    total = sum(latencies)
+    return {
+        "positions": len(positions),
+        "nodes": stats.nodes_generated,
+        "nodes_per_sec": stats.nodes_generated / total if total else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p90_ms": percentile(latencies, 90) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "total_s": total,
+    }
+
+
+def measure_memory(name, grid):
+    """Peak bytes allocated while answering one position."""
+    reset, move_fn, _ = ENGINES[name]
+    reset()
+    tracemalloc.start()
+    try:
+        move_fn([row[:] for row in grid])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmarks(corpus, engines, repeats=DEFAULT_REPEATS):
+    results = {}
+    for name in engines:
+        results[name] = {group: run_engine(name, positions, repeats) for group, positions in corpus.items()}
+        results[name]["peak_memory"] = measure_memory(name, corpus["empty"][0])
+    return results
+
+
+# ---------- Baselines ----------
+def find_regressions(results, baseline, tolerance, min_delta_ms=DEFAULT_MIN_DELTA_MS, nodes_only=False):
+    """Compare against a stored baseline; returns a list of messages.
+
+    Node counts are deterministic and must not grow at all. A p50 latency
+    only counts as a regression when it is both more than `tolerance`
+    slower and at least `min_delta_ms` slower, so microsecond jitter on
+    fast engines does not fail the gate. Timings only mean something
+    against a baseline saved on the same machine; pass --nodes-only to
+    gate on node counts alone.
+    """
+    problems = []
+    for name, groups in results.items():
+        for group, current in groups.items():
+            old = baseline.get(name, {}).get(group)
+            if old is None:
+                continue
+            if group == "peak_memory":
+                if not nodes_only and current > old * (1 + tolerance):
+                    problems.append(f"{name}: peak memory {current} B vs baseline {old} B")
+                continue
+            if current["nodes"] > old["nodes"]:
+                problems.append(f"{name}/{group}: {current['nodes']} nodes vs baseline {old['nodes']}")
+            if nodes_only:
+                continue
+            if (current["p50_ms"] > old["p50_ms"] * (1 + tolerance)
+                    and current["p50_ms"] - old["p50_ms"] >= min_delta_ms):
+                problems.append(f"{name}/{group}: p50 {current['p50_ms']:.3f} ms vs baseline {old['p50_ms']:.3f} ms")
+    return problems
+
+
+def print_report(results):
+    print(f"{'engine':<19}{'corpus':<15}{'positions':>10}{'nodes/s':>12}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+    for name, groups in results.items():
+        for group, row in groups.items():
+            if group == "peak_memory":
+                continue
+            print(f"{name:<19}{group:<15}{row['positions']:>10}{row['nodes_per_sec']:>12.0f}"
+                  f"{row['p50_ms']:>10.3f}{row['p90_ms']:>10.3f}{row['p99_ms']:>10.3f}")
+        print(f"{name:<19}{'peak memory':<15}{groups['peak_memory']:>10} B")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the LAB6 tic-tac-toe engines.")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--sample", type=int, default=None,
+                        help="positions sampled per corpus group (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the new baseline instead of comparing")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS,
+                        help="times each position is searched; the median is kept")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="ignore p50 slowdowns smaller than this")
+    parser.add_argument("--nodes-only", action="store_true",
+                        help="gate on node counts only, e.g. against a baseline from another machine")
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args(argv)
+
+    config = {"sample": args.sample, "seed": args.seed}
+    results = run_benchmarks(build_corpus(args.sample, args.seed), args.engines, args.repeats)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"config": config, **results}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline stored; run with --save-baseline to create one.")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("config") != config:
+        print(f"Baseline was made with {baseline.get('config')}, not {config}; not comparing.")
+        return 0
+    problems = find_regressions(results, baseline, args.tolerance, args.min_delta_ms, args.nodes_only)
+    for problem in problems:
+        print("REGRESSION:", problem)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Compact tic-tac-toe state shared by the LAB1 and LAB6 games.
+
+Each player's marks are a 9-bit integer where bit k is set when that player
+owns cell k (cells numbered 0-8, row by row). Win and draw checks become a
+single table lookup instead of a loop over lists of win conditions.
+"""
+
+# Bits for rows, columns and diagonals
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # Rows
+    0b001001001, 0b010010010, 0b100100100,  # Columns
+    0b100010001, 0b001010100,               # Diagonals
+)
+FULL = 0b111111111
+
+# The 8 rotations/reflections of the 3x3 grid, as index permutations of
+# the flattened board (cell k of the transformed board is cell sym[k]).
+SYMMETRIES = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8),  # identity
+    (6, 3, 0, 7, 4, 1, 8, 5, 2),  # rotate 90
+    (8, 7, 6, 5, 4, 3, 2, 1, 0),  # rotate 180
+    (2, 5, 8, 1, 4, 7, 0, 3, 6),  # rotate 270
+    (2, 1, 0, 5, 4, 3, 8, 7, 6),  # mirror left-right
+    (6, 7, 8, 3, 4, 5, 0, 1, 2),  # mirror top-bottom
+    (0, 3, 6, 1, 4, 7, 2, 5, 8),  # main diagonal
+    (8, 5, 2, 7, 4, 1, 6, 3, 0),  # anti-diagonal
+)
+
+
+def iter_bits(bits):
+    """Yield the index of every set bit, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def _transform(bits, sym):
+    """Apply a symmetry permutation to a 9-bit mask."""
+    result = 0
+    for k, src in enumerate(sym):
+        if bits >> src & 1:
+            result |= 1 << k
+    return result
+
+
+# Lookup tables indexed by a 9-bit mask
+IS_WIN = [any(bits & mask == mask for mask in WIN_MASKS) for bits in range(FULL + 1)]
+FREE_CELLS = [tuple(iter_bits(FULL & ~bits)) for bits in range(FULL + 1)]
+# Base-3 weight of each set bit, so a position maps to a dense index < 3**9
+TERNARY = [sum(3 ** k for k in iter_bits(bits)) for bits in range(FULL + 1)]
+SYMMETRY_TABLES = [[_transform(bits, sym) for bits in range(FULL + 1)] for sym in SYMMETRIES]
+
+
+def is_win(bits):
+    """Check if a player's marks contain a full line."""
+    return IS_WIN[bits]
+
+
+def cells_to_bits(cells, symbol):
+    """Mask of the cells in a flat board that hold the given symbol."""
+    bits = 0
+    for k, cell in enumerate(cells):
+        if cell == symbol:
+            bits |= 1 << k
+    return bits
+
+
+class BitBoard:
+    """Tic-tac-toe position stored as one 9-bit mask per player symbol."""
+
+    def __init__(self, symbols=('X', 'O')):
+        self.bits = dict.fromkeys(symbols, 0)
+
+    @classmethod
+    def from_cells(cls, cells, symbols=('X', 'O')):
+        """Build from a flat 9-cell board; anything not a symbol is empty."""
+        state = cls(symbols)
+        for symbol in symbols:
+            state.bits[symbol] = cells_to_bits(cells, symbol)
+        return state
+
+    @classmethod
+    def from_grid(cls, grid, symbols=('X', 'O')):
+        """Build from a 3x3 list of rows."""
+        return cls.from_cells([cell for row in grid for cell in row], symbols)
+
+    def occupied(self):
+        """Mask of all taken cells."""
+        result = 0
+        for bits in self.bits.values():
+            result |= bits
+        return result
+
+    def is_full(self):
+        return self.occupied() == FULL
+
+    def free_cells(self):
+        """Indices of the empty cells, lowest first."""
+        return FREE_CELLS[self.occupied()]
+
+    def winner(self):
+        """Return the winning symbol or None."""
+        for symbol, bits in self.bits.items():
+            if IS_WIN[bits]:
+                return symbol
+        return None
+
+    def make(self, cell, symbol):
+        """Place symbol on an empty cell."""
+        self.bits[symbol] |= 1 << cell
+
+    def unmake(self, cell, symbol):
+        """Take symbol back off a cell placed by make()."""
+        self.bits[symbol] &= ~(1 << cell)
+
+    def index(self):
+        """Dense base-3 position number: 0 empty, 1 first symbol, 2 second."""
+        a, b = self.bits.values()
+        return TERNARY[a] + 2 * TERNARY[b]
+
+    def canonical(self):
+        """Integer shared by all 8 symmetric variants of this position."""
+        a, b = self.bits.values()
+        return min((table[a] << 9) | table[b] for table in SYMMETRY_TABLES)
@@ -0,0 +1,28 @@
+import itertools
+
+from bitboard import BitBoard
+from minMax import AI, BOOK_PATH, EMPTY, HUMAN, NOT_IN_BOOK, search_best_move
+
+# Enumerate every position where the AI is to move and solve it once.
+# Either side may open, so the AI moves with equal counts or one mark behind.
+def build_book():
+    table = bytearray([NOT_IN_BOOK]) * 3 ** 9
+    solved = 0
+    for cells in itertools.product((EMPTY, AI, HUMAN), repeat=9):
+        ai_count = cells.count(AI)
+        human_count = cells.count(HUMAN)
+        if human_count - ai_count not in (0, 1):
+            continue
+        state = BitBoard.from_cells(cells, (AI, HUMAN))
+        if state.winner() or state.is_full():
+            continue
+        move, score = search_best_move(state)
+        table[state.index()] = (move << 2) | (score + 1)
+        solved += 1
+    return bytes(table), solved
+
+if __name__ == "__main__":
+    table, solved = build_book()
+    with open(BOOK_PATH, "wb") as f:
+        f.write(table)
+    print(f"Solved {solved} positions, wrote {len(table)} bytes to {BOOK_PATH}")
@@ -1,4 +1,11 @@
 import math
+import os
+import sys
+
+from bitboard import BitBoard, is_win
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from search_stats import SearchStats
 
 # Constants
 HUMAN = 'O'
@@ -10,6 +17,24 @@ board = [[EMPTY, EMPTY, EMPTY],
          [EMPTY, EMPTY, EMPTY],
          [EMPTY, EMPTY, EMPTY]]
 
+# Precomputed perfect-play table built by build_book.py: one byte per
+# BitBoard.index() of an AI-to-move position, (cell << 2) | (score + 1).
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tictactoe_book.bin")
+NOT_IN_BOOK = 0xFF
+
+# Load the opening book, or None if it has not been built
+def load_book(path=BOOK_PATH):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+book = load_book()
+
+# Work done by the searches since the last stats.reset()
+stats = SearchStats("minMax")
+
 # Print board with box numbers
 def print_board(board, show_numbers=False):
     print()
@@ -27,68 +52,68 @@ def print_board(board, show_numbers=False):
 
 # Check winner
 def check_winner(board):
-    # Rows and Columns
-    for i in range(3):
-        if board[i][0] == board[i][1] == board[i][2] != EMPTY:
-            return board[i][0]
-        if board[0][i] == board[1][i] == board[2][i] != EMPTY:
-            return board[0][i]
-    # Diagonals
-    if board[0][0] == board[1][1] == board[2][2] != EMPTY:
-        return board[0][0]
-    if board[0][2] == board[1][1] == board[2][0] != EMPTY:
-        return board[0][2]
-    return None
+    return BitBoard.from_grid(board, (AI, HUMAN)).winner()
 
 # Check if full
 def is_full(board):
-    return all(cell != EMPTY for row in board for cell in row)
+    return BitBoard.from_grid(board, (AI, HUMAN)).is_full()
 
 # Minimax
 def minimax(board, depth, is_maximizing):
-    winner = check_winner(board)
-    if winner == AI:
+    return _minimax(BitBoard.from_grid(board, (AI, HUMAN)), depth, is_maximizing)
+
+# Minimax over a BitBoard, updated in place with make/unmake
+def _minimax(state, depth, is_maximizing):
+    bits = state.bits
+    if is_win(bits[AI]):
         return 1
-    elif winner == HUMAN:
+    elif is_win(bits[HUMAN]):
         return -1
-    elif is_full(board):
+    elif state.is_full():
         return 0
 
+    stats.nodes_expanded += 1
+    stats.nodes_generated += len(state.free_cells())
     if is_maximizing:
         best_score = -math.inf
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] == EMPTY:
-                    board[i][j] = AI
-                    score = minimax(board, depth + 1, False)
-                    board[i][j] = EMPTY
-                    best_score = max(best_score, score)
+        for cell in state.free_cells():
+            state.make(cell, AI)
+            score = _minimax(state, depth + 1, False)
+            state.unmake(cell, AI)
+            best_score = max(best_score, score)
         return best_score
     else:
         best_score = math.inf
-        for i in range(3):
-            for j in range(3):
-                if board[i][j] == EMPTY:
-                    board[i][j] = HUMAN
-                    score = minimax(board, depth + 1, True)
-                    board[i][j] = EMPTY
-                    best_score = min(best_score, score)
+        for cell in state.free_cells():
+            state.make(cell, HUMAN)
+            score = _minimax(state, depth + 1, True)
+            state.unmake(cell, HUMAN)
+            best_score = min(best_score, score)
         return best_score
 
-# Find best move
-def best_move(board):
+# Find best move (and its score) by searching the whole game tree
+def search_best_move(state):
     best_score = -math.inf
     move = None
-    for i in range(3):
-        for j in range(3):
-            if board[i][j] == EMPTY:
-                board[i][j] = AI
-                score = minimax(board, 0, False)
-                board[i][j] = EMPTY
-                if score > best_score:
-                    best_score = score
-                    move = (i, j)
-    return move
+    for cell in state.free_cells():
+        state.make(cell, AI)
+        score = _minimax(state, 0, False)
+        state.unmake(cell, AI)
+        if score > best_score:
+            best_score = score
+            move = cell
+    return move, best_score
+
+# Find best move, answered from the book when it has the position
+def best_move(board):
+    state = BitBoard.from_grid(board, (AI, HUMAN))
+    if book is not None:
+        entry = book[state.index()]
+        if entry != NOT_IN_BOOK:
+            return divmod(entry >> 2, 3)
+    with stats.phase("best_move"):
+        move, _ = search_best_move(state)
+    return None if move is None else divmod(move, 3)
 
 # Convert box number (1-9) to (row, col)
 def box_to_coords(box):
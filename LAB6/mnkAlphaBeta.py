@@ -0,0 +1,303 @@
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from search_stats import SearchStats
+
+# Constants
+HUMAN = 'O'
+AI = 'X'
+EMPTY = ' '
+
+# Larger than any heuristic score, so wins and losses always dominate
+WIN_SCORE = 10 ** 12
+
+# Row/column steps for the four line directions
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget for a move runs out."""
+
+
+# ---------- Game Definition ----------
+class MNKGame:
+    """An m,n,k-game: get k in a row on a rows x cols board to win.
+
+    The board is a flat list of rows * cols cells. If neighbourhood is set,
+    move generation only considers empty cells within that many steps of an
+    existing mark, which keeps the branching factor sane on big boards.
+    """
+
+    def __init__(self, rows=3, cols=3, k=3, neighbourhood=None):
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.neighbourhood = neighbourhood
+        self.size = rows * cols
+        self.windows = self._build_windows()
+
+    def _build_windows(self):
+        """Every run of k cells in a straight line."""
+        windows = []
+        for r in range(self.rows):
+            for c in range(self.cols):
+                for dr, dc in DIRECTIONS:
+                    end_r, end_c = r + dr * (self.k - 1), c + dc * (self.k - 1)
+                    if 0 <= end_r < self.rows and 0 <= end_c < self.cols:
+                        windows.append(tuple((r + dr * i) * self.cols + c + dc * i for i in range(self.k)))
+        return windows
+
+    def new_board(self):
+        return [EMPTY] * self.size
+
+    def is_winning_move(self, board, cell, symbol):
+        """Check if the mark just placed on cell completes k in a row."""
+        r, c = divmod(cell, self.cols)
+        for dr, dc in DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                rr, cc = r + sign * dr, c + sign * dc
+                while 0 <= rr < self.rows and 0 <= cc < self.cols and board[rr * self.cols + cc] == symbol:
+                    count += 1
+                    rr += sign * dr
+                    cc += sign * dc
+            if count >= self.k:
+                return True
+        return False
+
+    def check_winner(self, board):
+        """Return the winner ('X', 'O') or None."""
+        for window in self.windows:
+            first = board[window[0]]
+            if first != EMPTY and all(board[cell] == first for cell in window):
+                return first
+        return None
+
+    def candidate_moves(self, board):
+        """Empty cells worth searching, in board order."""
+        empty = [cell for cell in range(self.size) if board[cell] == EMPTY]
+        if self.neighbourhood is None:
+            return empty
+        if len(empty) == self.size:
+            return [(self.rows // 2) * self.cols + self.cols // 2]
+
+        reach = self.neighbourhood
+        near = []
+        for cell in empty:
+            r, c = divmod(cell, self.cols)
+            if any(board[rr * self.cols + cc] != EMPTY
+                   for rr in range(max(0, r - reach), min(self.rows, r + reach + 1))
+                   for cc in range(max(0, c - reach), min(self.cols, c + reach + 1))):
+                near.append(cell)
+        return near or empty
+
+
+# ---------- Heuristics ----------
+def window_heuristic(game, board):
+    """Score open lines: 10**n for every window holding n AI marks and no
+    HUMAN marks, minus the same for HUMAN."""
+    score = 0
+    for window in game.windows:
+        ai = human = 0
+        for cell in window:
+            if board[cell] == AI:
+                ai += 1
+            elif board[cell] == HUMAN:
+                human += 1
+        if ai and not human:
+            score += 10 ** ai
+        elif human and not ai:
+            score -= 10 ** human
+    return score
+
+
+# ---------- Iterative Deepening Alpha-Beta ----------
+class IterativeDeepeningSearch:
+    """Depth-limited alpha-beta, deepened one ply at a time until the time
+    budget runs out. evaluate(game, board) scores horizon positions from
+    the AI's point of view and must stay well inside +/- WIN_SCORE."""
+
+    def __init__(self, game, evaluate=window_heuristic, time_limit=1.0, max_depth=None, stats=None):
+        self.game = game
+        self.evaluate = evaluate
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.pv = []
+        self.stats = stats if stats is not None else SearchStats("mnkAlphaBeta")
+        self.deadline = None
+
+    def search(self, board):
+        """Return (cell, score, depth reached, principal variation) for the AI."""
+        moves = self.game.candidate_moves(board)
+        if not moves or self.game.check_winner(board):
+            return None, 0, 0, []
+
+        self.deadline = time.perf_counter() + self.time_limit
+        self.pv = []
+        remaining = board.count(EMPTY)
+        max_depth = remaining if self.max_depth is None else min(self.max_depth, remaining)
+        result = (moves[0], 0, 0, [moves[0]])
+
+        for depth in range(1, max_depth + 1):
+            try:
+                with self.stats.phase(f"depth {depth}"):
+                    score, line = self._alphabeta(board, depth, 0, -WIN_SCORE - 1, WIN_SCORE + 1, True, None, True)
+            except SearchTimeout:
+                self.stats.count("timeouts")
+                break
+            self.pv = line
+            result = (line[0], score, depth, line)
+            if abs(score) >= WIN_SCORE - depth:
+                # Forced result found, deeper search cannot change it
+                break
+        return result
+
+    def _order(self, moves, ply, on_pv):
+        """Try the previous iteration's principal variation move first."""
+        if on_pv and ply < len(self.pv) and self.pv[ply] in moves:
+            moves.remove(self.pv[ply])
+            moves.insert(0, self.pv[ply])
+        return moves
+
+    def _alphabeta(self, board, depth, ply, alpha, beta, is_maximizing, last_move, on_pv):
+        """Return (score, principal variation) for the side to move."""
+        if time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        if last_move is not None and self.game.is_winning_move(board, last_move, board[last_move]):
+            # The player who just moved has won; prefer quicker wins.
+            return (-(WIN_SCORE - ply) if is_maximizing else WIN_SCORE - ply), []
+
+        moves = self.game.candidate_moves(board)
+        if not moves:
+            return 0, []
+        if depth == 0:
+            return self.evaluate(self.game, board), []
+
+        self.stats.nodes_expanded += 1
+        moves = self._order(moves, ply, on_pv)
+        symbol = AI if is_maximizing else HUMAN
+        best_line = []
+        best_score = -WIN_SCORE - 1 if is_maximizing else WIN_SCORE + 1
+
+        for cell in moves:
+            self.stats.nodes_generated += 1
+            board[cell] = symbol
+            try:
+                score, line = self._alphabeta(board, depth - 1, ply + 1, alpha, beta, not is_maximizing, cell,
+                                              on_pv and ply < len(self.pv) and cell == self.pv[ply])
+            finally:
+                board[cell] = EMPTY
+
+            if is_maximizing:
+                if score > best_score:
+                    best_score, best_line = score, [cell] + line
+                alpha = max(alpha, score)
+            else:
+                if score < best_score:
+                    best_score, best_line = score, [cell] + line
+                beta = min(beta, score)
+            if beta <= alpha:
+                # Prune: no need to explore further
+                self.stats.cutoffs += 1
+                break
+        return best_score, best_line
+
+
+def best_move(game, board, time_limit=1.0, max_depth=None, evaluate=window_heuristic):
+    """Find the best (row, col) for the AI within the time budget."""
+    cell, _, _, _ = IterativeDeepeningSearch(game, evaluate, time_limit, max_depth).search(board)
+    return None if cell is None else divmod(cell, game.cols)
+
+
+# ---------- Parallel Root Split ----------
+def _score_root_move(args):
+    """Worker: fixed-depth score of the AI playing cell."""
+    game, board, cell, depth, evaluate = args
+    search = IterativeDeepeningSearch(game, evaluate)
+    search.deadline = math.inf
+    board[cell] = AI
+    score, _ = search._alphabeta(board, depth - 1, 1, -WIN_SCORE - 1, WIN_SCORE + 1, False, cell, False)
+    return score
+
+
+def parallel_best_move(game, board, depth, max_workers=None, evaluate=window_heuristic):
+    """Fixed-depth search with the root moves spread over a process pool.
+
+    Returns the same (row, col) as a sequential depth-limited search;
+    evaluate must be a module-level function so it can be pickled.
+    depth counts the root move, so it must be at least 1.
+    """
+    if depth < 1:
+        raise ValueError(f"depth must be at least 1, got {depth}")
+    moves = game.candidate_moves(board)
+    if not moves or game.check_winner(board):
+        return None
+
+    jobs = [(game, board, cell, depth, evaluate) for cell in moves]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        scores = list(executor.map(_score_root_move, jobs))
+
+    # First best in move order, matching the sequential search
+    best = max(range(len(moves)), key=lambda i: (scores[i], -i))
+    return divmod(moves[best], game.cols)
+
+
+# ---------- Game Loop ----------
+def print_board(game, board):
+    """Print the current board with box numbers on empty cells."""
+    width = len(str(game.size))
+    print()
+    for r in range(game.rows):
+        row = board[r * game.cols:(r + 1) * game.cols]
+        print(" | ".join(cell.rjust(width) if cell != EMPTY else str(r * game.cols + c + 1).rjust(width)
+                         for c, cell in enumerate(row)))
+    print()
+
+
+def play_game(game, time_limit=1.0):
+    print(f"{game.rows}x{game.cols}, {game.k} in a row — You are O, AI is X")
+    board = game.new_board()
+    print_board(game, board)
+
+    while True:
+        # Human move
+        try:
+            move = int(input(f"Enter box number (1–{game.size}): ")) - 1
+            if not 0 <= move < game.size or board[move] != EMPTY:
+                print("Invalid or taken box! Try another.")
+                continue
+        except ValueError:
+            print(f"Please enter a number (1–{game.size}).")
+            continue
+
+        board[move] = HUMAN
+        print_board(game, board)
+        if game.is_winning_move(board, move, HUMAN):
+            print("🎉 You win!")
+            break
+        elif EMPTY not in board:
+            print("It's a draw!")
+            break
+
+        # AI move
+        print("AI is thinking...")
+        cell, score, depth, _ = IterativeDeepeningSearch(game, time_limit=time_limit).search(board)
+        board[cell] = AI
+        print(f"AI searched {depth} plies deep (score {score}).")
+        print_board(game, board)
+        if game.is_winning_move(board, cell, AI):
+            print("🤖 AI wins!")
+            break
+        elif EMPTY not in board:
+            print("It's a draw!")
+            break
+
+
+# ---------- Run ----------
+if __name__ == "__main__":
+    play_game(MNKGame(4, 4, 3), time_limit=2.0)
@@ -0,0 +1,113 @@
+"""
+Exact distance table for the 8-puzzle (and smaller boards).
+
+The 8-puzzle has only 9! / 2 = 181,440 solvable boards, so instead of
+searching per query, one retrograde breadth-first search from the goal
+records the optimal distance of every board. Boards are indexed by the
+Lehmer-code rank of the whole permutation, one byte each, and the table is
+saved next to the pattern databases and memory-mapped on later loads.
+
+An optimal path is then read off greedily: from any board, some neighbour
+is exactly one move closer to the goal.
+
+    table = DistanceTable()
+    table.distance((8, 6, 7, 2, 5, 4, 3, 0, 1))   # 31
+    path = table.solve((8, 6, 7, 2, 5, 4, 3, 0, 1))
+"""
+import hashlib
+import math
+import os
+
+from pattern_database import DEFAULT_CACHE_DIR, UNREACHED, load_or_build_table, rank_cells
+from sliding_puzzle import BLANK, blank_moves, board_size, goal_tiles
+
+# One byte per permutation: 9! entries is 363 KB, 16! would be 21 TB
+MAX_CELLS = 9
+
+
+def build_distance_table(goal):
+    """
+    Breadth-first search backwards from the goal over whole boards.
+
+    Returns a bytearray indexed by rank_cells(board) holding each board's
+    distance to the goal, or UNREACHED for boards of the wrong parity.
+    """
+    cells = len(goal)
+    moves = blank_moves(board_size(goal))
+    dist = bytearray([UNREACHED]) * math.factorial(cells)
+    dist[rank_cells(goal, cells)] = 0
+
+    level = [(list(goal), goal.index(BLANK))]
+    depth = 0
+    while level:
+        depth += 1
+        next_level = []
+        for board, blank in level:
+            for new_blank, _ in moves[blank]:
+                child = board[:]
+                child[blank], child[new_blank] = child[new_blank], BLANK
+                rank = rank_cells(child, cells)
+                if dist[rank] == UNREACHED:
+                    dist[rank] = depth
+                    next_level.append((child, new_blank))
+        level = next_level
+    return dist
+
+
+class DistanceTable:
+    """
+    Optimal distance of every board to one goal, with O(1) lookups.
+
+    Args:
+        goal: Flat goal tuple; defaults to the usual 8-puzzle goal.
+        cache_dir: Where the table is stored; it is built and saved if missing.
+    """
+
+    def __init__(self, goal=None, cache_dir=DEFAULT_CACHE_DIR):
+        self.goal = tuple(goal) if goal else goal_tiles(3)
+        self.size = board_size(self.goal)
+        self.cells = len(self.goal)
+        if self.cells > MAX_CELLS:
+            raise ValueError(f"A full distance table for a {self.size}x{self.size} board is too large; "
+                             "use a PatternDatabase instead")
+        if sorted(self.goal) != list(range(self.cells)):
+            raise ValueError("The goal must hold each tile 0 .. size*size - 1 once")
+        self.moves = blank_moves(self.size)
+        self.cache_dir = cache_dir
+        self.table = load_or_build_table(self.table_path(), lambda: build_distance_table(self.goal))
+
+    def table_path(self):
+        """File holding the table for this goal."""
+        digest = hashlib.sha1(repr(self.goal).encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"distances_{self.size}x{self.size}_{digest}.bin")
+
+    def distance(self, tiles):
+        """Number of moves in an optimal solution, or None if the board is unsolvable."""
+        if len(tiles) != self.cells:
+            raise ValueError(f"Expected {self.cells} tiles, got {len(tiles)}")
+        if sorted(tiles) != list(range(self.cells)):
+            raise ValueError(f"The board must hold each tile 0 .. {self.cells - 1} once, got {tuple(tiles)}")
+        value = self.table[rank_cells(tiles, self.cells)]
+        return None if value == UNREACHED else value
+
+    def solve(self, tiles):
+        """
+        An optimal path from tiles to the goal as a list of tuples, like
+        a_star_solve, or None if the board is unsolvable.
+        """
+        remaining = self.distance(tiles)
+        if remaining is None:
+            return None
+        board = list(tiles)
+        blank = board.index(BLANK)
+        path = [tuple(board)]
+        while remaining:
+            remaining -= 1
+            for new_blank, _ in self.moves[blank]:
+                board[blank], board[new_blank] = board[new_blank], BLANK
+                if self.table[rank_cells(board, self.cells)] == remaining:
+                    blank = new_blank
+                    break
+                board[new_blank], board[blank] = board[blank], BLANK
+            path.append(tuple(board))
+        return path
@@ -0,0 +1,80 @@
+"""
+Conflict bookkeeping shared by the N-Queens solvers in LAB4.
+
+A board is a list where board[column] = row. Rather than comparing every
+pair of queens, ConflictCounter keeps how many queens sit on each row,
+diagonal and anti-diagonal. The number of attacking pairs and the change
+from moving one queen then cost O(1) instead of O(n^2).
+
+The board and counters are stored in flat arrays of C ints rather than
+lists, so a million-queen board takes a few tens of MB.
+"""
+import operator
+from array import array
+
+
+def attacking_pairs(count):
+    """Pairs of queens that attack each other along a line holding count queens."""
+    return count * (count - 1) // 2
+
+
+class ConflictCounter:
+    """
+    Row, diagonal and anti-diagonal occupancy of a board, kept up to date
+    as queens move. Cell (row, col) lies on diagonal row - col + n - 1 and
+    anti-diagonal row + col.
+    """
+
+    def __init__(self, board):
+        self.board = array("i", board)
+        self.n = n = len(self.board)
+        self.rows = array("i", [0]) * n
+        self.diagonals = array("i", [0]) * (2 * n - 1)
+        self.anti_diagonals = array("i", [0]) * (2 * n - 1)
+        for col, row in enumerate(self.board):
+            self.rows[row] += 1
+            self.diagonals[row - col + n - 1] += 1
+            self.anti_diagonals[row + col] += 1
+        self.total = (sum(map(attacking_pairs, self.rows))
+                      + sum(map(attacking_pairs, self.diagonals))
+                      + sum(map(attacking_pairs, self.anti_diagonals)))
+
+    def conflicts(self):
+        """Number of attacking pairs, as calculate_attacking_queens() would count them."""
+        return self.total
+
+    def queen_conflicts(self, col):
+        """Number of queens attacking the queen in col."""
+        row = self.board[col]
+        return self.rows[row] + self.diagonals[row - col + self.n - 1] + self.anti_diagonals[row + col] - 3
+
+    def placement_costs(self, col):
+        """
+        For every row, the queens on the lines through (row, col). For rows
+        other than the queen's own this is how many queens would attack it
+        there, computed in one pass over the counters.
+        """
+        n = self.n
+        lines = map(operator.add, self.rows, self.diagonals[n - 1 - col:2 * n - 1 - col])
+        return list(map(operator.add, lines, self.anti_diagonals[col:col + n]))
+
+    def delta(self, col, row):
+        """Change in the number of attacking pairs if the queen in col moved to row."""
+        if row == self.board[col]:
+            return 0
+        n = self.n
+        return (self.rows[row] + self.diagonals[row - col + n - 1] + self.anti_diagonals[row + col]
+                - self.queen_conflicts(col))
+
+    def move(self, col, row):
+        """Moves the queen in col to row, updating the counters."""
+        self.total += self.delta(col, row)
+        old = self.board[col]
+        n = self.n
+        self.rows[old] -= 1
+        self.diagonals[old - col + n - 1] -= 1
+        self.anti_diagonals[old + col] -= 1
+        self.board[col] = row
+        self.rows[row] += 1
+        self.diagonals[row - col + n - 1] += 1
+        self.anti_diagonals[row + col] += 1
@@ -0,0 +1,85 @@
+"""
+Work counters shared by the search algorithms in the LAB folders.
+
+Every search takes an optional SearchStats and fills it in as it runs:
+
+    stats = SearchStats("a_star")
+    with stats.phase("solve", trace_memory=True):
+        path = a_star_solve(board, stats=stats)
+    stats.emit()
+
+The labs are standalone scripts rather than a package. Shared modules
+(this one, sliding_puzzle.py, pattern_database.py, distance_table.py and
+n_queens.py) live at the repository root, and each lab script puts the
+root on sys.path before importing them. LAB1 does the same with LAB6 to
+reuse its bitboard engine.
+"""
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class SearchStats:
+    """Nodes, frontier size, cutoffs, timings and peak memory of one search."""
+
+    def __init__(self, name=""):
+        self.name = name
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.max_frontier = 0
+        self.cutoffs = 0
+        self.peak_memory = None  # bytes, only set by phase(trace_memory=True)
+        self.phases = {}         # phase name -> seconds
+        self.counters = {}       # algorithm-specific extras (restarts, ...)
+
+    def frontier(self, size):
+        """Record the current open list / stack size."""
+        if size > self.max_frontier:
+            self.max_frontier = size
+
+    def count(self, name, amount=1):
+        """Bump an algorithm-specific counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def phase(self, name, trace_memory=False):
+        """Time a block; repeated phases with the same name accumulate."""
+        started_tracing = trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        elif trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+            if trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                self.peak_memory = max(self.peak_memory or 0, peak)
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def reset(self):
+        self.__init__(self.name)
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "max_frontier": self.max_frontier,
+            "cutoffs": self.cutoffs,
+            "peak_memory": self.peak_memory,
+            "phases": dict(self.phases),
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self):
+        return json.dumps(self.as_dict())
+
+    def emit(self, stream=None):
+        """Write the stats as one JSON line (stderr by default)."""
+        print(self.to_json(), file=stream or sys.stderr)
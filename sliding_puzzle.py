@@ -0,0 +1,111 @@
+"""
+Board helpers shared by the sliding-puzzle solvers in LAB3 and LAB4.
+
+A board is a flat sequence of size * size tiles read row by row, with 0 as
+the blank, so the same code handles the 8-, 15- and 24-puzzle.
+"""
+import math
+
+BLANK = 0
+
+# Blank moves as (row step, column step, name)
+DIRECTIONS = [(-1, 0, "Up"), (1, 0, "Down"), (0, -1, "Left"), (0, 1, "Right")]
+
+
+def board_size(tiles):
+    """Side length of a flat board; raises ValueError if it is not square."""
+    size = math.isqrt(len(tiles))
+    if size < 2 or size * size != len(tiles):
+        raise ValueError(f"A sliding puzzle needs a square board, got {len(tiles)} tiles")
+    return size
+
+
+def goal_tiles(size):
+    """The usual goal: tiles in order with the blank in the bottom-right."""
+    return tuple(range(1, size * size)) + (BLANK,)
+
+
+def blank_moves(size):
+    """For every blank cell, the (new blank cell, direction name) of each legal move."""
+    moves = []
+    for blank in range(size * size):
+        r, c = divmod(blank, size)
+        moves.append([((r + dr) * size + c + dc, name)
+                      for dr, dc, name in DIRECTIONS
+                      if 0 <= r + dr < size and 0 <= c + dc < size])
+    return moves
+
+
+def tile_bits(size):
+    """Bits per cell when packing a size x size board into an integer (4 up to the 15-puzzle)."""
+    return (size * size - 1).bit_length()
+
+
+def pack_tiles(tiles, bits):
+    """Packs a flat board into an integer, cell k at bits k*bits .. (k+1)*bits - 1."""
+    state = 0
+    for cell, tile in enumerate(tiles):
+        state |= tile << (bits * cell)
+    return state
+
+
+def unpack_tiles(state, cells, bits):
+    """Inverse of pack_tiles, as a tuple."""
+    mask = (1 << bits) - 1
+    return tuple((state >> (bits * cell)) & mask for cell in range(cells))
+
+
+def slide_tile(state, blank, new_blank, bits):
+    """
+    Slides the tile at new_blank into the blank of a packed board and
+    returns (new state, tile). Sliding it back undoes the move.
+    """
+    tile = (state >> (bits * new_blank)) & ((1 << bits) - 1)
+    return state ^ (tile << (bits * new_blank)) ^ (tile << (bits * blank)), tile
+
+
+def manhattan_table(goal):
+    """table[tile][cell]: grid distance from cell to the tile's goal cell (0 for the blank)."""
+    size = board_size(goal)
+    table = [[0] * len(goal) for _ in range(len(goal))]
+    for goal_cell, tile in enumerate(goal):
+        if tile == BLANK:
+            continue
+        goal_r, goal_c = divmod(goal_cell, size)
+        for cell in range(len(goal)):
+            r, c = divmod(cell, size)
+            table[tile][cell] = abs(r - goal_r) + abs(c - goal_c)
+    return table
+
+
+def is_solvable(tiles, goal=None):
+    """
+    Checks if goal can be reached from tiles by sliding moves.
+
+    Every move swaps the blank with a neighbour, flipping the parity of the
+    permutation and moving the blank one step. So the permutation taking
+    tiles to goal (blank included) must have the same parity as the blank's
+    grid distance to its goal cell. Works for any size and any goal.
+    """
+    size = board_size(tiles)
+    goal = goal_tiles(size) if goal is None else tuple(goal)
+    if sorted(tiles) != sorted(goal) or len(set(goal)) != len(goal):
+        return False
+
+    goal_index = {tile: cell for cell, tile in enumerate(goal)}
+    perm = [goal_index[tile] for tile in tiles]
+    seen = [False] * len(perm)
+    transpositions = 0
+    for start in range(len(perm)):
+        length = 0
+        cell = start
+        while not seen[cell]:
+            seen[cell] = True
+            cell = perm[cell]
+            length += 1
+        transpositions += max(length - 1, 0)
+
+    blank_r, blank_c = divmod(list(tiles).index(BLANK), size)
+    goal_r, goal_c = divmod(goal.index(BLANK), size)
+    distance = abs(blank_r - goal_r) + abs(blank_c - goal_c)
+    return transpositions % 2 == distance % 2
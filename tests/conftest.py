@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The labs are standalone scripts (see search_stats.py), so the tests put
+# the repository root and the lab folders they import from on sys.path.
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+for folder in ("", "LAB4", "LAB6"):
+    sys.path.insert(0, os.path.join(ROOT, folder))
@@ -0,0 +1,102 @@
+import random
+
+import A_star
+from distance_table import DistanceTable
+from search_stats import SearchStats
+
+PUZZLES = """\
+# A mix of good and bad lines
+8 6 7 2 5 4 3 0 1
+1 2 3 4 5 6 7 8
+1 2 3 4 5 6 7 x 0
+1 1 3 4 5 6 7 8 0
+1,2,3,4,5,6,8,7,0
+1 2 3 4 5 6 7 0 8
+"""
+
+
+def test_solve_many_reports_bad_lines_and_keeps_going():
+    boards = list(A_star.read_boards(PUZZLES.splitlines()))
+    for workers in (1, 2):
+        results = list(A_star.solve_many(boards, workers=workers))
+        assert [result["index"] for result in results] == list(range(6))
+        assert [result["status"] for result in results] == [
+            "solved", "invalid", "invalid", "invalid", "unsolvable", "solved"]
+        assert results[0]["moves"] == 31
+        assert results[5]["moves"] == 1
+        assert "8 tiles" in results[1]["reason"]
+        assert "integers" in results[2]["reason"]
+        assert "exactly once" in results[3]["reason"]
+
+    # Sizes without default patterns only fail their own entry in a --pdb run
+    boards += [tuple(range(1, 4)) + (0,), tuple(range(1, 25)) + (0,)]
+    for workers in (1, 2):
+        results = list(A_star.solve_many(boards, workers=workers, use_pdb=True))
+        assert [result["status"] for result in results] == [
+            "solved", "invalid", "invalid", "invalid", "unsolvable", "solved", "invalid", "invalid"]
+        assert results[0]["moves"] == 31
+        assert "2x2" in results[6]["reason"] and "5x5" in results[7]["reason"]
+
+
+def test_validate_board_accepts_ints_and_tokens():
+    assert A_star.validate_board(["1", "2", "3", "0"]) == (1, 2, 3, 0)
+    assert A_star.validate_board((1, 2, 3, 0)) == (1, 2, 3, 0)
+
+
+def test_pattern_database_search_stays_optimal(tmp_path):
+    goal = A_star.goal_tiles(3)
+    pdb = A_star.PatternDatabase(goal, [(1, 2, 4), (3, 5, 6), (7, 8)], cache_dir=str(tmp_path))
+    rng = random.Random(1)
+    for _ in range(40):
+        board = tuple(rng.sample(goal, len(goal)))
+        if not A_star.is_solvable(board, goal):
+            continue
+        assert len(A_star.a_star_solve(board, pdb=pdb)) == len(A_star.a_star_solve(board))
+
+
+def random_boards(count, seed=0):
+    """Random solvable 8-puzzles, plus the solved board."""
+    goal = A_star.goal_tiles(3)
+    rng = random.Random(seed)
+    boards = [goal]
+    while len(boards) < count + 1:
+        board = tuple(rng.sample(goal, len(goal)))
+        if A_star.is_solvable(board, goal):
+            boards.append(board)
+    return boards
+
+
+def assert_legal_path(path, board, goal):
+    """Path runs from board to goal, each step sliding one tile into the blank."""
+    assert path[0] == board and path[-1] == goal
+    for before, after in zip(path, path[1:]):
+        changed = [cell for cell in range(len(before)) if before[cell] != after[cell]]
+        assert len(changed) == 2
+        first, second = changed
+        assert 0 in (before[first], before[second])
+        assert before[first] == after[second] and before[second] == after[first]
+        row_gap, col_gap = abs(first // 3 - second // 3), abs(first % 3 - second % 3)
+        assert row_gap + col_gap == 1
+
+
+def test_search_variants_find_optimal_legal_paths(tmp_path):
+    goal = A_star.goal_tiles(3)
+    table = DistanceTable(goal, cache_dir=str(tmp_path))
+    solvers = [A_star.a_star_solve, A_star.bidirectional_a_star, A_star.bidirectional_bfs]
+    for board in random_boards(8):
+        for solve in solvers:
+            path = solve(board)
+            assert len(path) - 1 == table.distance(board), solve.__name__
+            assert_legal_path(path, board, goal)
+
+
+def test_sma_star_stays_optimal_within_its_memory_limit(tmp_path):
+    goal = A_star.goal_tiles(3)
+    table = DistanceTable(goal, cache_dir=str(tmp_path))
+    for board in random_boards(4, seed=1):
+        for memory_limit in (30, 60, 100_000):
+            stats = SearchStats("sma_star")
+            path = A_star.sma_star_solve(board, memory_limit, stats)
+            assert len(path) - 1 == table.distance(board)
+            assert_legal_path(path, board, goal)
+            assert stats.max_frontier <= memory_limit
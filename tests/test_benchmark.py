@@ -0,0 +1,23 @@
+import benchmark
+
+
+def _row(nodes, p50_ms):
+    return {"nodes": nodes, "p50_ms": p50_ms}
+
+
+def test_find_regressions_ignores_jitter_but_not_extra_nodes():
+    baseline = {"alphabeta": {"near_terminal": _row(100, 0.010), "empty": _row(1000, 5.0)}}
+    jitter = {"alphabeta": {"near_terminal": _row(100, 0.030), "empty": _row(1000, 5.5)}}
+    assert benchmark.find_regressions(jitter, baseline, 0.25) == []
+
+    slower = {"alphabeta": {"near_terminal": _row(101, 0.010), "empty": _row(1000, 9.0)}}
+    problems = benchmark.find_regressions(slower, baseline, 0.25)
+    assert len(problems) == 2
+    assert benchmark.find_regressions(slower, baseline, 0.25, nodes_only=True) == problems[:1]
+
+
+def test_alphabeta_without_table_finds_the_same_moves():
+    positions = benchmark.build_corpus(sample=30)["mid_game"]
+    for grid in positions:
+        assert benchmark._alphabeta_plain(grid) == benchmark._alphabeta_cold(grid)
+    assert benchmark.alphaBeta.use_transposition_table
@@ -0,0 +1,14 @@
+import pytest
+
+from distance_table import DistanceTable
+
+
+def test_distance_rejects_boards_that_are_not_permutations(tmp_path):
+    table = DistanceTable(cache_dir=str(tmp_path))
+    assert table.distance((1, 2, 3, 4, 5, 6, 7, 0, 8)) == 1
+    assert len(table.solve((1, 2, 3, 4, 5, 6, 0, 7, 8))) == 3
+    for tiles in [(1, 1, 3, 4, 5, 6, 7, 8, 0), (1, 2, 3, 4, 5, 6, 7, 8, 9)]:
+        with pytest.raises(ValueError, match="once"):
+            table.distance(tiles)
+        with pytest.raises(ValueError, match="once"):
+            table.solve(tiles)
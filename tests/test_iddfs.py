@@ -0,0 +1,48 @@
+import importlib.util
+import os
+import random
+
+from distance_table import DistanceTable
+from pattern_database import PatternDatabase
+from search_stats import SearchStats
+
+# The LAB3 script's file name is not a valid module name
+_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "LAB3", "8puzzle(using_iddfs).py")
+_SPEC = importlib.util.spec_from_file_location("iddfs_8puzzle", _PATH)
+iddfs = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(iddfs)
+
+GOAL = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+
+
+def random_boards(count, seed=0):
+    """Random solvable 3x3 boards as lists of rows."""
+    rng = random.Random(seed)
+    goal = iddfs.flatten(GOAL)
+    boards = []
+    while len(boards) < count:
+        tiles = rng.sample(goal, len(goal))
+        if iddfs.is_solvable(tuple(tiles), goal):
+            boards.append([tiles[0:3], tiles[3:6], tiles[6:9]])
+    return boards
+
+
+def test_ida_star_with_partial_pattern_database_reaches_the_goal(tmp_path):
+    # Tiles 4-8 are in no pattern, so h is 0 long before the board is solved
+    pdb = PatternDatabase(iddfs.flatten(GOAL), [(1, 2, 3)], cache_dir=str(tmp_path))
+    node = iddfs.ida_star([[4, 1, 3], [7, 2, 6], [5, 8, 0]], GOAL, pdb=pdb)
+    assert node.board == GOAL
+
+
+def test_ida_star_pdb_paths_are_optimal(tmp_path):
+    goal = iddfs.flatten(GOAL)
+    table = DistanceTable(goal, cache_dir=str(tmp_path))
+    pdbs = [PatternDatabase(goal, patterns, cache_dir=str(tmp_path))
+            for patterns in ([(1, 2, 4), (3, 5, 6), (7, 8)], [(1, 2, 3)])]
+    for board in random_boards(6):
+        for pdb in pdbs:
+            stats = SearchStats("ida_star")
+            node = iddfs.ida_star(board, GOAL, stats, pdb)
+            assert node.board == GOAL
+            assert node.depth == table.distance(iddfs.flatten(board))
+            assert stats.nodes_expanded > 0
@@ -0,0 +1,18 @@
+from min_conflicts import min_conflicts
+from n_queens import ConflictCounter
+from search_stats import SearchStats
+
+
+def test_min_conflicts_adds_to_the_callers_stats():
+    fresh = SearchStats("min_conflicts")
+    board = min_conflicts(2000, seed=1, stats=fresh)
+    assert ConflictCounter(board).conflicts() == 0
+
+    stats = SearchStats("min_conflicts")
+    stats.nodes_expanded = stats.nodes_generated = 100
+    min_conflicts(2000, seed=1, stats=stats)
+    assert stats.nodes_expanded == stats.nodes_generated == 100 + fresh.nodes_expanded
+
+    limited = SearchStats("min_conflicts")
+    assert min_conflicts(2000, max_steps=5, seed=1, stats=limited) is None
+    assert limited.nodes_expanded == 5
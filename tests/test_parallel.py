@@ -0,0 +1,51 @@
+import math
+import random
+
+import pytest
+
+import alphaBeta
+import mnkAlphaBeta
+from mnkAlphaBeta import AI, EMPTY, HUMAN, IterativeDeepeningSearch, MNKGame, window_heuristic
+
+
+def random_positions(cells, count, seed=0):
+    """Positions reached by random play with the AI to move, none of them over."""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = [EMPTY] * cells
+        free = list(range(cells))
+        rng.shuffle(free)
+        for ply in range(rng.randrange(0, cells - 2, 2)):
+            board[free[ply]] = HUMAN if ply % 2 == 0 else AI
+        positions.append(board)
+    return positions
+
+
+def test_alphabeta_parallel_matches_best_move():
+    for cells in random_positions(9, 8):
+        grid = [cells[0:3], cells[3:6], cells[6:9]]
+        if alphaBeta.check_winner(grid):
+            continue
+        alphaBeta.clear_transposition_table()
+        assert alphaBeta.parallel_best_move([row[:] for row in grid], max_workers=2) == alphaBeta.best_move(grid)
+
+
+@pytest.mark.parametrize("rows, cols, k, depth", [(3, 3, 3, 9), (4, 4, 3, 3)])
+def test_mnk_parallel_matches_iterative_deepening(rows, cols, k, depth):
+    game = MNKGame(rows, cols, k)
+    for board in random_positions(game.size, 6, seed=depth):
+        if game.check_winner(board):
+            continue
+        cell, score, _, _ = IterativeDeepeningSearch(game, max_depth=depth, time_limit=math.inf).search(board)
+        row, col = mnkAlphaBeta.parallel_best_move(game, board, depth, max_workers=2)
+        # Equal scores can break ties differently, so compare what the moves are worth
+        parallel_cell = row * game.cols + col
+        parallel_score = mnkAlphaBeta._score_root_move((game, board[:], parallel_cell, depth, window_heuristic))
+        assert parallel_score == score, (board, cell, parallel_cell)
+
+
+def test_mnk_parallel_rejects_depth_below_one():
+    game = MNKGame()
+    with pytest.raises(ValueError):
+        mnkAlphaBeta.parallel_best_move(game, game.new_board(), 0)